@@ -7,32 +7,19 @@ Main entry point for the task orchestration engine.
 import sys
 import os
 import argparse
-import uuid
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 # Add the project root to the path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from loom.engine import TaskEngine
-from loom.config import load_task_config
-from loom.cli_tools import (
-    list_tasks, validate_task, show_task_info,
-    list_states, export_results, show_state
-)
-from loom.state import StateManager
-from loom.logger import LoomLogger
-from loom.retry import RetryManager, RetryStrategy
-from loom.timeout import TimeoutManager
-from loom.utils import calculate_task_hash
-from loom.web import LoomWebServer
+# Subsystem imports are deferred into the command branches that use them so
+# that lightweight commands (``--help``, ``list``) don't pay for the engine,
+# colorama or Flask at startup.
 
 
-def main():
-    """Main CLI entry point."""
-    parser = argparse.ArgumentParser(
-        description="Loom: Autonomous Task Weaver - Execute complex multi-step AI engineering workflows",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+_EPILOG = """
 Examples:
   loom --run tasks/dashboard.yaml          # Run a task
   loom --list                              # List all tasks
@@ -41,12 +28,10 @@ Examples:
   loom --states                            # List saved states
   loom --export <execution_id>             # Export results
         """
-    )
-    
-    # Subcommands
-    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
-    
-    # Run command
+
+
+def _build_run_parser(subparsers) -> None:
+    """Add the ``run`` subcommand."""
     run_parser = subparsers.add_parser('run', help='Run a task configuration')
     run_parser.add_argument(
         'task_file',
@@ -84,8 +69,16 @@ Examples:
         type=str,
         help='Path to log file'
     )
-    
-    # List command
+    run_parser.add_argument(
+        '--resume',
+        type=str,
+        metavar='EXECUTION_ID',
+        help='Reuse results of unchanged tasks completed in a saved execution'
+    )
+
+
+def _build_list_parser(subparsers) -> None:
+    """Add the ``list`` subcommand."""
     list_parser = subparsers.add_parser('list', help='List all available tasks')
     list_parser.add_argument(
         '--tasks-dir',
@@ -93,8 +86,10 @@ Examples:
         default='tasks',
         help='Directory containing task files (default: tasks)'
     )
-    
-    # Validate command
+
+
+def _build_validate_parser(subparsers) -> None:
+    """Add the ``validate`` subcommand."""
     validate_parser = subparsers.add_parser('validate', help='Validate a task configuration')
     validate_parser.add_argument(
         'task_file',
@@ -106,27 +101,35 @@ Examples:
         action='store_true',
         help='Show detailed validation info'
     )
-    
-    # Info command
+
+
+def _build_info_parser(subparsers) -> None:
+    """Add the ``info`` subcommand."""
     info_parser = subparsers.add_parser('info', help='Show detailed task information')
     info_parser.add_argument(
         'task_file',
         type=str,
         help='Path to task YAML configuration file'
     )
-    
-    # States command
-    states_parser = subparsers.add_parser('states', help='List saved execution states')
-    
-    # State command
+
+
+def _build_states_parser(subparsers) -> None:
+    """Add the ``states`` subcommand."""
+    subparsers.add_parser('states', help='List saved execution states')
+
+
+def _build_state_parser(subparsers) -> None:
+    """Add the ``state`` subcommand."""
     state_parser = subparsers.add_parser('state', help='Show details of a saved state')
     state_parser.add_argument(
         'execution_id',
         type=str,
         help='Execution identifier'
     )
-    
-    # Export command
+
+
+def _build_export_parser(subparsers) -> None:
+    """Add the ``export`` subcommand."""
     export_parser = subparsers.add_parser('export', help='Export execution results')
     export_parser.add_argument(
         'execution_id',
@@ -138,8 +141,10 @@ Examples:
         type=str,
         help='Output file path (default: <execution_id>_results.json)'
     )
-    
-    # GUI command
+
+
+def _build_gui_parser(subparsers) -> None:
+    """Add the ``gui`` subcommand."""
     gui_parser = subparsers.add_parser('gui', help='Start Kanban board web interface')
     gui_parser.add_argument(
         '--host',
@@ -158,6 +163,67 @@ Examples:
         action='store_true',
         help='Enable debug mode'
     )
+
+
+# Subcommand name -> builder, in the order they appear in ``--help``
+_SUBPARSER_BUILDERS = {
+    'run': _build_run_parser,
+    'list': _build_list_parser,
+    'validate': _build_validate_parser,
+    'info': _build_info_parser,
+    'states': _build_states_parser,
+    'state': _build_state_parser,
+    'export': _build_export_parser,
+    'gui': _build_gui_parser,
+}
+
+
+def _sniff_subcommand(argv):
+    """
+    Return the subcommand named on the command line, if any.
+    
+    Args:
+        argv: Command-line arguments (without the program name)
+        
+    Returns:
+        The first positional token if it is a known subcommand, else None
+    """
+    for token in argv:
+        if token.startswith('-'):
+            continue
+        return token if token in _SUBPARSER_BUILDERS else None
+    return None
+
+
+@lru_cache(maxsize=None)
+def _build_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """
+    Build the CLI argument parser.
+    
+    Parsers are cached per subcommand so repeated in-process invocations
+    (tests, REPL use) reuse them.
+    
+    Args:
+        command: Subcommand to build a subparser for, or None for all
+        
+    Returns:
+        Configured argument parser
+    """
+    parser = argparse.ArgumentParser(
+        description="Loom: Autonomous Task Weaver - Execute complex multi-step AI engineering workflows",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG
+    )
+    
+    # Subcommands: only build the one being invoked; fall back to all of
+    # them for --help, bare invocations and unknown commands
+    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
+    
+    if command:
+        _SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for build in _SUBPARSER_BUILDERS.values():
+            build(subparsers)
     
     # Backward compatibility: --run flag
     parser.add_argument(
@@ -176,33 +242,24 @@ Examples:
         help='Validate configuration without executing tasks'
     )
     
+    return parser
+
+
+def main():
+    """Main CLI entry point."""
+    parser = _build_parser(_sniff_subcommand(sys.argv[1:]))
     args = parser.parse_args()
     
-    # Handle backward compatibility
+    # Handle backward compatibility: fold --run into the run command so
+    # everything downstream only has to look at args.command/args.task_file
     if args.run:
         args.command = 'run'
         args.task_file = args.run
     
     # Execute command
-    if args.command == 'run' or args.run:
-        _run_task(args)
-    elif args.command == 'list':
-        list_tasks(Path(args.tasks_dir))
-    elif args.command == 'validate':
-        success = validate_task(Path(args.task_file), args.verbose)
-        sys.exit(0 if success else 1)
-    elif args.command == 'info':
-        show_task_info(Path(args.task_file))
-    elif args.command == 'states':
-        list_states()
-    elif args.command == 'state':
-        show_state(args.execution_id)
-    elif args.command == 'export':
-        output_path = Path(args.output) if args.output else None
-        export_results(args.execution_id, output_path)
-    elif args.command == 'gui':
-        server = LoomWebServer(host=args.host, port=args.port)
-        server.run(debug=args.debug)
+    handler = _DISPATCH.get(args.command)
+    if handler:
+        handler(args)
     else:
         parser.print_help()
         sys.exit(1)
@@ -210,7 +267,13 @@ Examples:
 
 def _run_task(args):
     """Run a task configuration."""
-    task_file = Path(args.task_file if hasattr(args, 'task_file') else args.run)
+    import secrets
+    from loom.config import load_task_config
+    from loom.engine import TaskEngine
+    from loom.state import StateManager
+    from loom.utils import calculate_task_hash
+    
+    task_file = Path(args.task_file)
     
     if not task_file.exists():
         print(f"❌ Error: Task file not found: {task_file}", file=sys.stderr)
@@ -227,30 +290,40 @@ def _run_task(args):
         print("✅ Configuration validated successfully (dry-run mode)")
         return
     
-    # Initialize logger
+    # Initialize logger only when there is something beyond the engine's
+    # own console output to log
     log_file = Path(args.log_file) if hasattr(args, 'log_file') and args.log_file else None
-    logger = LoomLogger(verbose=args.verbose, log_file=log_file)
+    logger = None
+    if args.verbose or log_file:
+        from loom.logger import LoomLogger
+        logger = LoomLogger(verbose=args.verbose, log_file=log_file)
     
     # Initialize engine with retry and timeout
     engine = TaskEngine(verbose=args.verbose)
     
     # Add retry manager if specified
     if hasattr(args, 'retry') and args.retry > 0:
+        from loom.retry import RetryManager
         retry_manager = RetryManager(max_retries=args.retry)
         engine.retry_manager = retry_manager
     
     # Add timeout manager if specified
     if hasattr(args, 'timeout') and args.timeout:
+        from loom.timeout import TimeoutManager
         timeout_manager = TimeoutManager(default_timeout=args.timeout)
         engine.timeout_manager = timeout_manager
     
     # Generate execution ID
-    execution_id = str(uuid.uuid4())[:8]
+    execution_id = secrets.token_hex(4)
     state_manager = StateManager()
     
     try:
-        # Execute
-        engine.execute(config)
+        # Execute, optionally reusing a previous execution's results
+        resume_id = args.resume if hasattr(args, 'resume') else None
+        if resume_id:
+            engine.resume(config, resume_id, state_manager)
+        else:
+            engine.execute(config)
         
         # Save state if requested
         if hasattr(args, 'save_state') and args.save_state:
@@ -259,6 +332,8 @@ def _run_task(args):
                     execution_id,
                     engine.root_node,
                     engine.all_nodes,
+                    parent_ids=engine.parent_ids,
+                    child_ids=engine.child_ids,
                     metadata={
                         "task_file": str(task_file),
                         "config_hash": calculate_task_hash(config)
@@ -276,6 +351,8 @@ def _run_task(args):
                     execution_id,
                     engine.root_node,
                     engine.all_nodes,
+                    parent_ids=engine.parent_ids,
+                    child_ids=engine.child_ids,
                     metadata={
                         "task_file": str(task_file),
                         "interrupted": True
@@ -290,6 +367,78 @@ def _run_task(args):
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        engine.close()
+        if logger is not None:
+            logger.close()
+
+
+def _list_command(args):
+    """Handle the ``list`` command."""
+    from loom.cli_tools import list_tasks
+    list_tasks(Path(args.tasks_dir))
+
+
+def _validate_command(args):
+    """Handle the ``validate`` command."""
+    from loom.cli_tools import validate_task
+    success = validate_task(Path(args.task_file), args.verbose)
+    sys.exit(0 if success else 1)
+
+
+def _info_command(args):
+    """Handle the ``info`` command."""
+    from loom.cli_tools import show_task_info
+    show_task_info(Path(args.task_file))
+
+
+def _states_command(args):
+    """Handle the ``states`` command."""
+    from loom.cli_tools import list_states
+    list_states()
+
+
+def _state_command(args):
+    """Handle the ``state`` command."""
+    from loom.cli_tools import show_state
+    show_state(args.execution_id)
+
+
+def _export_command(args):
+    """Handle the ``export`` command."""
+    from loom.cli_tools import export_results
+    output_path = Path(args.output) if args.output else None
+    export_results(args.execution_id, output_path)
+
+
+def _gui_command(args):
+    """Handle the ``gui`` command."""
+    # With gevent installed the board is served by its WSGI server, which
+    # needs blocking stdlib calls (threads, queues, sleeps in the engine)
+    # patched to cooperate before they are imported
+    if not args.debug:
+        try:
+            from gevent import monkey
+        except ImportError:
+            pass
+        else:
+            monkey.patch_all()
+    from loom.web import LoomWebServer
+    server = LoomWebServer(host=args.host, port=args.port)
+    server.run(debug=args.debug)
+
+
+# Command name -> handler
+_DISPATCH = {
+    'run': _run_task,
+    'list': _list_command,
+    'validate': _validate_command,
+    'info': _info_command,
+    'states': _states_command,
+    'state': _state_command,
+    'export': _export_command,
+    'gui': _gui_command,
+}
 
 
 if __name__ == "__main__":
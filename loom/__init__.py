@@ -7,29 +7,64 @@ __version__ = "0.1.0"
 __author__ = "Mehmet T. AKALIN"
 __license__ = "MIT"
 
-from loom.engine import TaskEngine, TaskNode, TaskStatus
-from loom.config import load_task_config, validate_task_config
-from loom.state import StateManager
-from loom.logger import LoomLogger
-from loom.retry import RetryManager, RetryStrategy
-from loom.timeout import TimeoutManager
-from loom.validator import TaskValidator
-from loom.web import LoomWebServer
-from loom.utils import (
-    calculate_task_hash, format_duration, format_timestamp,
-    flatten_task_tree, aggregate_results, create_task_summary
-)
+# Public names are resolved lazily on first access (PEP 562) so that
+# ``import loom`` doesn't pull in the engine, colorama or Flask up front.
+_LAZY = {
+    "TaskEngine": ("loom.engine", "TaskEngine"),
+    "TaskNode": ("loom.engine", "TaskNode"),
+    "TaskStatus": ("loom.engine", "TaskStatus"),
+    "CycleError": ("loom.engine", "CycleError"),
+    "UnknownDependency": ("loom.engine", "UnknownDependency"),
+    "load_task_config": ("loom.config", "load_task_config"),
+    "validate_task_config": ("loom.config", "validate_task_config"),
+    "StateManager": ("loom.state", "StateManager"),
+    "LoomLogger": ("loom.logger", "LoomLogger"),
+    "RetryManager": ("loom.retry", "RetryManager"),
+    "RetryStrategy": ("loom.retry", "RetryStrategy"),
+    "TimeoutManager": ("loom.timeout", "TimeoutManager"),
+    "AsyncTimeoutManager": ("loom.timeout", "AsyncTimeoutManager"),
+    "TaskValidator": ("loom.validator", "TaskValidator"),
+    "LoomWebServer": ("loom.web", "LoomWebServer"),
+    "calculate_task_hash": ("loom.utils", "calculate_task_hash"),
+    "calculate_node_hash": ("loom.utils", "calculate_node_hash"),
+    "format_duration": ("loom.utils", "format_duration"),
+    "format_timestamp": ("loom.utils", "format_timestamp"),
+    "flatten_task_tree": ("loom.utils", "flatten_task_tree"),
+    "aggregate_results": ("loom.utils", "aggregate_results"),
+    "create_task_summary": ("loom.utils", "create_task_summary"),
+    "summarize_task_tree": ("loom.utils", "summarize_task_tree"),
+    "build_path_index": ("loom.utils", "build_path_index"),
+    "find_node_by_path": ("loom.utils", "find_node_by_path"),
+}
 
 __all__ = [
     "TaskEngine", "TaskNode", "TaskStatus",
+    "CycleError", "UnknownDependency",
     "load_task_config", "validate_task_config",
     "StateManager",
     "LoomLogger",
     "RetryManager", "RetryStrategy",
-    "TimeoutManager",
+    "TimeoutManager", "AsyncTimeoutManager",
     "TaskValidator",
     "LoomWebServer",
-    "calculate_task_hash", "format_duration", "format_timestamp",
-    "flatten_task_tree", "aggregate_results", "create_task_summary"
+    "calculate_task_hash", "calculate_node_hash", "format_duration", "format_timestamp",
+    "flatten_task_tree", "aggregate_results", "create_task_summary",
+    "summarize_task_tree", "build_path_index", "find_node_by_path"
 ]
 
+
+def __getattr__(name):
+    """Import and cache a public name on first access."""
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module 'loom' has no attribute '{name}'") from None
+
+    import importlib
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
@@ -3,17 +3,50 @@ CLI utility tools for Loom.
 """
 
 import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from colorama import Fore, Style
+from typing import Dict, Any, List, Optional, Tuple
+
+if sys.stdout.isatty():
+    from colorama import Fore, Style
+else:
+    class _NoColor:
+        """Stand-in for colorama's Fore/Style that yields empty codes."""
+        
+        def __getattr__(self, name: str) -> str:
+            return ""
+    
+    # Color codes are useless when piping to a file or CI log
+    Fore = Style = _NoColor()
 
 from loom.config import load_task_config
 from loom.validator import TaskValidator
-from loom.state import StateManager
 from loom.utils import format_duration, format_timestamp, create_task_summary
 
 
+@lru_cache(maxsize=1)
+def _state_manager():
+    """Return the process-wide StateManager, importing it on first use."""
+    from loom.state import StateManager
+    return StateManager()
+
+
+def _count_subtasks(cfg: Dict[str, Any]) -> int:
+    """Count all nested sub-tasks of a configuration."""
+    total = 0
+    stack = list(cfg.get("sub_tasks", ()))
+    while stack:
+        sub_task = stack.pop()
+        total += 1
+        sub_tasks = sub_task.get("sub_tasks")
+        if sub_tasks:
+            stack.extend(sub_tasks)
+    return total
+
+
 def list_tasks(tasks_dir: Path = Path("tasks")) -> None:
     """
     List all available task configurations.
@@ -27,7 +60,12 @@ def list_tasks(tasks_dir: Path = Path("tasks")) -> None:
         print(f"{Fore.RED}❌ Tasks directory not found: {tasks_dir}{Style.RESET_ALL}")
         return
     
-    task_files = list(tasks_dir.glob("*.yaml")) + list(tasks_dir.glob("*.yml"))
+    # Single directory pass; only matching entries become Path objects
+    with os.scandir(tasks_dir) as entries:
+        task_files = sorted(
+            Path(entry.path) for entry in entries
+            if entry.name.endswith((".yaml", ".yml")) and entry.is_file()
+        )
     
     if not task_files:
         print(f"{Fore.YELLOW}No task files found in {tasks_dir}{Style.RESET_ALL}")
@@ -35,26 +73,45 @@ def list_tasks(tasks_dir: Path = Path("tasks")) -> None:
     
     print(f"\n{Fore.CYAN}{Style.BRIGHT}📋 Available Tasks{Style.RESET_ALL}\n")
     
-    for task_file in sorted(task_files):
-        try:
-            config = load_task_config(task_file)
-            task_name = config.get("task", "Unknown")
-            print(f"  {Fore.GREEN}•{Style.RESET_ALL} {task_file.name}")
-            print(f"    {Fore.CYAN}Task:{Style.RESET_ALL} {task_name}")
-            
-            # Count sub-tasks
-            def _count_subtasks(cfg: Dict[str, Any]) -> int:
-                count = len(cfg.get("sub_tasks", []))
-                for sub_task in cfg.get("sub_tasks", []):
-                    count += _count_subtasks(sub_task)
-                return count
-            
-            subtask_count = _count_subtasks(config)
-            if subtask_count > 0:
-                print(f"    {Fore.CYAN}Sub-tasks:{Style.RESET_ALL} {subtask_count}")
-            print()
-        except Exception as e:
-            print(f"  {Fore.RED}✗{Style.RESET_ALL} {task_file.name} {Fore.RED}(Error: {e}){Style.RESET_ALL}\n")
+    # Parsing is independent per file; overlap it when there are enough files
+    if len(task_files) < 4:
+        results = [_try_load_listing(task_file) for task_file in task_files]
+    else:
+        with ThreadPoolExecutor(max_workers=min(8, len(task_files))) as executor:
+            results = list(executor.map(_try_load_listing, task_files))
+    
+    for task_file, (config, error) in zip(task_files, results):
+        if error is not None:
+            print(f"  {Fore.RED}✗{Style.RESET_ALL} {task_file.name} {Fore.RED}(Error: {error}){Style.RESET_ALL}\n")
+            continue
+        
+        task_name = config.get("task", "Unknown")
+        print(f"  {Fore.GREEN}•{Style.RESET_ALL} {task_file.name}")
+        print(f"    {Fore.CYAN}Task:{Style.RESET_ALL} {task_name}")
+        
+        # Count sub-tasks
+        subtask_count = _count_subtasks(config)
+        if subtask_count > 0:
+            print(f"    {Fore.CYAN}Sub-tasks:{Style.RESET_ALL} {subtask_count}")
+        print()
+
+
+def _try_load_listing(task_file: Path) -> Tuple[Optional[Dict[str, Any]], Optional[Exception]]:
+    """
+    Load what list_tasks needs from a task file.
+    
+    Args:
+        task_file: Path to task file
+    
+    Returns:
+        Tuple of (config, error); exactly one of them is None
+    """
+    try:
+        # The sub-task count needs the whole tree, so go through the
+        # cached full load rather than a header read
+        return load_task_config(task_file), None
+    except Exception as e:
+        return None, e
 
 
 def validate_task(task_file: Path, verbose: bool = False) -> bool:
@@ -75,19 +132,26 @@ def validate_task(task_file: Path, verbose: bool = False) -> bool:
         return False
     
     validator = TaskValidator()
-    is_valid, errors = validator.validate_file(task_file)
+    
+    # Parse once and run every check against the same dict
+    try:
+        config = load_task_config(task_file)
+    except Exception as e:
+        is_valid, errors = False, [str(e)]
+    else:
+        is_valid, errors = validator.validate_config(config)
     
     if is_valid:
         print(f"{Fore.GREEN}✅ Task configuration is valid{Style.RESET_ALL}")
         
         if verbose:
-            analysis = validator.analyze_config(task_file)
+            analysis = validator.analyze_config_dict(config)
             print(f"\n{Fore.CYAN}Analysis:{Style.RESET_ALL}")
             for key, value in analysis.items():
                 print(f"  {key}: {value}")
         
         # Check for cycles
-        has_cycles, cycle_errors = validator.check_dependency_cycles(task_file)
+        has_cycles, cycle_errors = validator.check_dependency_cycles_dict(config)
         if has_cycles:
             print(f"{Fore.GREEN}✅ No circular dependencies detected{Style.RESET_ALL}")
         else:
@@ -120,7 +184,7 @@ def show_task_info(task_file: Path) -> None:
     try:
         config = load_task_config(task_file)
         validator = TaskValidator()
-        analysis = validator.analyze_config(task_file)
+        analysis = validator.analyze_config_dict(config)
     except Exception as e:
         print(f"{Fore.RED}❌ Error loading task: {e}{Style.RESET_ALL}")
         return
@@ -140,7 +204,7 @@ def list_states() -> None:
     """
     List all saved execution states.
     """
-    state_manager = StateManager()
+    state_manager = _state_manager()
     states = state_manager.list_states()
     
     if not states:
@@ -168,7 +232,7 @@ def export_results(execution_id: str, output_path: Optional[Path] = None) -> Non
         execution_id: Execution identifier
         output_path: Output file path (optional)
     """
-    state_manager = StateManager()
+    state_manager = _state_manager()
     
     if output_path is None:
         output_path = Path(f"{execution_id}_results.json")
@@ -187,7 +251,7 @@ def show_state(execution_id: str) -> None:
     Args:
         execution_id: Execution identifier
     """
-    state_manager = StateManager()
+    state_manager = _state_manager()
     state = state_manager.load_state(execution_id)
     
     if not state:
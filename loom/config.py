@@ -2,10 +2,53 @@
 Configuration loading and validation for Loom task definitions.
 """
 
+import copy
+import sys
+import threading
 import yaml
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+# Validated configs keyed by (resolved path, mtime_ns, size), most recent last
+_PARSE_CACHE: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_PARSE_CACHE_SIZE = 256
+_PARSE_CACHE_LOCK = threading.Lock()
+
+# Config keys, interned once so per-node lookups hit the identity fast path
+_K_TASK = sys.intern("task")
+_K_SUB = sys.intern("sub_tasks")
+_K_DEPS = sys.intern("depends_on")
+_K_ACTION = sys.intern("action")
+_K_PARALLEL = sys.intern("parallel")
+_K_GATE = sys.intern("human_gate")
+_K_ID = sys.intern("id")
+_K_TIMEOUT = sys.intern("timeout")
+_K_PURE = sys.intern("pure")
+_K_CPU_BOUND = sys.intern("cpu_bound")
+
+# Task ids, both as ids and in depends_on, are interned too: the engine and
+# validator key dicts and sets on them, and equal ids then share one object
+_intern = sys.intern
+
+# Keys kept only when present in the source config
+_OPTIONAL_KEYS = (_K_TIMEOUT, _K_PURE, _K_CPU_BOUND)
+
+# Optional fields that must be booleans
+_FLAG_KEYS = (_K_PURE, _K_CPU_BOUND)
+
+# Keys kept by validation; anything else forces a normalized copy
+_NODE_KEYS = frozenset((_K_TASK, _K_PARALLEL, _K_GATE, _K_DEPS, _K_ACTION, _K_SUB) + _OPTIONAL_KEYS)
+_SUB_TASK_KEYS = _NODE_KEYS | {_K_ID}
+
+# Marks a sub-task that had no id of its own
+_MISSING = object()
+
 
 def load_task_config(config_path: Path) -> Dict[str, Any]:
     """
@@ -27,24 +70,51 @@ def load_task_config(config_path: Path) -> Dict[str, Any]:
     if not config_path.exists():
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
     
-    with open(config_path, 'r', encoding='utf-8') as f:
-        try:
-            config = yaml.safe_load(f)
-        except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML syntax: {e}")
+    stat = config_path.stat()
+    cache_key = (str(config_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    with _PARSE_CACHE_LOCK:
+        cached = _PARSE_CACHE.get(cache_key)
+        if cached is not None:
+            _PARSE_CACHE.move_to_end(cache_key)
+    if cached is not None:
+        # Hand out a copy so callers can't mutate the cached tree
+        return copy.deepcopy(cached)
     
-    if not config:
-        raise ValueError("Configuration file is empty")
+    # Hand bytes straight to the loader; it detects and decodes UTF-8 itself
+    with open(config_path, 'rb') as f:
+        config = _parse_yaml(f)
     
     # Validate and normalize configuration
     validated = validate_task_config(config)
-    return validated
+    
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE[cache_key] = validated
+        if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+            _PARSE_CACHE.popitem(last=False)
+    
+    return copy.deepcopy(validated)
+
+
+def _parse_yaml(source: Any) -> Dict[str, Any]:
+    """Parse a YAML document from a string, bytes or file object."""
+    try:
+        config = yaml.load(source, Loader=_Loader)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid YAML syntax: {e}")
+    
+    if not config:
+        raise ValueError("Configuration file is empty")
+    
+    return config
 
 
 def validate_task_config(config: Dict[str, Any]) -> Dict[str, Any]:
     """
     Validate and normalize task configuration structure.
     
+    The tree is walked with an explicit stack rather than recursion, so
+    arbitrarily deep ``sub_tasks`` nesting is supported.
+    
     Args:
         config: Raw configuration dictionary
         
@@ -54,44 +124,142 @@ def validate_task_config(config: Dict[str, Any]) -> Dict[str, Any]:
     if not isinstance(config, dict):
         raise ValueError("Configuration must be a dictionary")
     
-    # Required fields
-    if "task" not in config:
-        raise ValueError("Configuration must include a 'task' field")
+    validated = _normalize_node(config)
     
-    # Normalize structure
-    validated = {
-        "task": str(config["task"]),
-        "parallel": config.get("parallel", False),
-        "human_gate": config.get("human_gate", False),
-        "depends_on": config.get("depends_on", []),
-        "action": config.get("action", ""),
-        "sub_tasks": []
-    }
+    # Raw id of every sub-task dict seen so far, by identity. YAML aliases
+    # can repeat one dict, and conforming dicts get their id written in
+    # place, so a repeat is normalized from a copy carrying its own id
+    seen: Dict[int, Any] = {}
     
-    # Validate and process sub_tasks
-    if "sub_tasks" in config:
-        if not isinstance(config["sub_tasks"], list):
+    # Each entry pairs a raw config with its validated (still childless) shell
+    stack = [(config, validated)]
+    while stack:
+        raw, shell = stack.pop()
+        if _K_SUB not in raw:
+            continue
+        
+        sub_tasks = raw[_K_SUB]
+        if not isinstance(sub_tasks, list):
             raise ValueError("'sub_tasks' must be a list")
         
-        for i, sub_task in enumerate(config["sub_tasks"]):
+        children = []
+        pending = []
+        add_child = children.append
+        add_pending = pending.append
+        for i, sub_task in enumerate(sub_tasks):
             if not isinstance(sub_task, dict):
                 raise ValueError(f"Sub-task {i} must be a dictionary")
             
-            validated_sub = validate_task_config(sub_task)
-            
-            # Preserve id if present
-            if "id" in sub_task:
-                validated_sub["id"] = str(sub_task["id"])
+            key = id(sub_task)
+            if key in seen:
+                raw_id = seen[key]
+                sub_task = copy.deepcopy(sub_task)
+                if raw_id is _MISSING:
+                    sub_task.pop(_K_ID, None)
+                else:
+                    sub_task[_K_ID] = raw_id
             else:
-                validated_sub["id"] = f"subtask_{i}"
+                seen[key] = sub_task.get(_K_ID, _MISSING)
             
-            validated["sub_tasks"].append(validated_sub)
+            # Preserve id if present (read before sub_task may be reused)
+            sub_id = _intern(str(sub_task[_K_ID]) if _K_ID in sub_task else f"subtask_{i}")
+            
+            validated_sub = _normalize_node(sub_task, _SUB_TASK_KEYS)
+            validated_sub[_K_ID] = sub_id
+            
+            add_child(validated_sub)
+            add_pending((sub_task, validated_sub))
+        
+        shell[_K_SUB] = children
+        
+        # Reverse so siblings are visited in declaration order
+        stack.extend(reversed(pending))
+    
+    return validated
+
+
+def _normalize_node(
+    config: Dict[str, Any],
+    allowed_keys: Optional[frozenset] = None
+) -> Dict[str, Any]:
+    """
+    Validate a single config node and return its normalized form.
+    
+    Nodes that already conform (only known keys, no type coercion needed)
+    are normalized in place and returned as-is; anything else is copied
+    into a fresh dict. ``sub_tasks`` is (re)attached by
+    ``validate_task_config``.
+    """
+    if allowed_keys is None:
+        allowed_keys = _NODE_KEYS
+    
+    _get = config.get
+    
+    # Required fields
+    if _K_TASK not in config:
+        raise ValueError("Configuration must include a 'task' field")
+    
+    if _conforms(config, allowed_keys):
+        setdefault = config.setdefault
+        setdefault(_K_PARALLEL, False)
+        setdefault(_K_GATE, False)
+        setdefault(_K_DEPS, [])
+        setdefault(_K_ACTION, "")
+        setdefault(_K_SUB, [])
+        depends_on = config[_K_DEPS]
+        if depends_on:
+            config[_K_DEPS] = [_intern(dep) for dep in depends_on]
+        return config
+    
+    # Normalize structure
+    validated = {
+        _K_TASK: str(config[_K_TASK]),
+        _K_PARALLEL: _get(_K_PARALLEL, False),
+        _K_GATE: _get(_K_GATE, False),
+        _K_DEPS: _get(_K_DEPS, []),
+        _K_ACTION: _get(_K_ACTION, ""),
+        _K_SUB: []
+    }
     
     # Validate depends_on
-    if validated["depends_on"]:
-        if not isinstance(validated["depends_on"], list):
+    if validated[_K_DEPS]:
+        if not isinstance(validated[_K_DEPS], list):
             raise ValueError("'depends_on' must be a list")
-        validated["depends_on"] = [str(dep) for dep in validated["depends_on"]]
+        validated[_K_DEPS] = [_intern(str(dep)) for dep in validated[_K_DEPS]]
+    
+    # Optional fields
+    for key in _OPTIONAL_KEYS:
+        if key in config:
+            validated[key] = config[key]
+    
+    timeout = _get(_K_TIMEOUT)
+    if timeout is not None:
+        try:
+            validated[_K_TIMEOUT] = float(timeout)
+        except (TypeError, ValueError):
+            raise ValueError("'timeout' must be a number") from None
+    
+    for key in _FLAG_KEYS:
+        if key in validated:
+            validated[key] = bool(validated[key])
     
     return validated
 
+
+def _conforms(config: Dict[str, Any], allowed_keys: frozenset) -> bool:
+    """Check whether a node can be normalized without copying."""
+    if type(config[_K_TASK]) is not str or not allowed_keys.issuperset(config):
+        return False
+    
+    timeout = config.get(_K_TIMEOUT)
+    if timeout is not None and type(timeout) not in (int, float):
+        return False
+    
+    for key in _FLAG_KEYS:
+        if type(config.get(key, False)) is not bool:
+            return False
+    
+    depends_on = config.get(_K_DEPS)
+    if not depends_on:
+        return True
+    return type(depends_on) is list and all(type(dep) is str for dep in depends_on)
@@ -2,28 +2,67 @@
 Core task execution engine with hierarchical state machine.
 """
 
+import asyncio
+import hashlib
+import heapq
+import inspect
+import itertools
+import os
+import queue
+import sys
 import time
 import threading
-from typing import Dict, Any, List, Set, Optional
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Set, Optional
 from dataclasses import dataclass, field
-from enum import Enum
 from colorama import init, Fore, Style
 
+from loom.status import STATUS_NAMES, TaskStatus
+from loom.utils import ThreadSafeDict, build_path_index
+
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
 
+# Pre-built color prefixes for the per-task log lines
+_START_PREFIX = f"{Fore.GREEN}▶️  ["
+_COMPLETE_PREFIX = f"{Fore.GREEN}✅ ["
+_ERROR_PREFIX = f"{Fore.RED}❌ ["
+_DIM = Style.DIM
+_RESET = Style.RESET_ALL
 
-class TaskStatus(Enum):
-    """Task execution status."""
-    PENDING = "pending"
-    RUNNING = "running"
-    COMPLETED = "completed"
-    FAILED = "failed"
-    BLOCKED = "blocked"
-    WAITING_HUMAN = "waiting_human"
+# Most lines the log writer joins into a single stdout write
+_LOG_BATCH = 64
 
+# Most results kept by the per-engine cache of pure task actions
+_ACTION_CACHE_SIZE = 1024
 
-@dataclass
+# Most status changes kept in TaskEngine.deltas
+_DELTA_HISTORY = 4096
+
+# Single-byte needle per status code, for counting over the status column
+_STATUS_BYTES = tuple(bytes((code,)) for code in range(len(STATUS_NAMES)))
+
+
+class CycleError(ValueError):
+    """Raised when task dependencies form a cycle."""
+    
+    def __init__(self, node_ids: List[str]):
+        self.node_ids = node_ids
+        super().__init__(f"Circular dependency among tasks: {', '.join(node_ids)}")
+
+
+class UnknownDependency(ValueError):
+    """Raised when a task depends on a task id that doesn't exist."""
+    
+    def __init__(self, dep_id: str, node_id: str):
+        self.dep_id = dep_id
+        self.node_id = node_id
+        super().__init__(f"Task '{node_id}' depends on unknown task '{dep_id}'")
+
+
+@dataclass(slots=True)
 class TaskNode:
     """Represents a single task node in the execution tree."""
     id: str
@@ -35,19 +74,65 @@ class TaskNode:
     sub_tasks: List['TaskNode']
     status: TaskStatus = TaskStatus.PENDING
     parent: Optional['TaskNode'] = None
-    task_path: str = ""
     result: Optional[Any] = None
     error: Optional[str] = None
     start_time: Optional[float] = None
     end_time: Optional[float] = None
+    timeout: Optional[float] = None
+    pure: bool = False
+    cpu_bound: bool = False
+    index: int = -1
+    _task_path: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
-    def __post_init__(self):
-        """Initialize task path after creation."""
-        if not self.task_path:
-            if self.parent:
-                self.task_path = f"{self.parent.task_path}/{self.id}"
-            else:
-                self.task_path = self.id
+    @property
+    def task_path(self) -> str:
+        """Slash-separated ids from the root, built on first access and cached."""
+        if self._task_path is None:
+            # Walk up to the nearest ancestor with a known path, then fill
+            # in the paths on the way back down
+            chain = []
+            node = self
+            while node is not None and node._task_path is None:
+                chain.append(node)
+                node = node.parent
+            path = node._task_path if node is not None else None
+            for pending in reversed(chain):
+                path = f"{path}/{pending.id}" if path is not None else pending.id
+                pending._task_path = path
+        return self._task_path
+    
+    @task_path.setter
+    def task_path(self, value: str) -> None:
+        self._task_path = value
+
+
+@dataclass
+class _GateRequest:
+    """A human gate waiting to be prompted for on the scheduler thread."""
+    node: TaskNode
+    answered: threading.Event = field(default_factory=threading.Event)
+    approved: bool = False
+
+
+def execute_action(payload: Dict[str, Any]) -> Any:
+    """
+    Run a task action described by a plain payload.
+    
+    Kept at module level, taking only picklable data, so CPU-bound actions
+    can run in a worker process.
+    
+    Args:
+        payload: Node fields needed by the action (id, task, action,
+            task_path, depends_on)
+        
+    Returns:
+        Action result
+    """
+    # In a real implementation, this would integrate with AI models
+    # For now, we simulate execution
+    time.sleep(0.1)
+    
+    return {"status": "executed", "action": payload["action"]}
 
 
 class TaskEngine:
@@ -55,54 +140,360 @@ class TaskEngine:
     Main task orchestration engine with support for:
     - Infinite nesting of tasks
     - Parallel execution
-    - Dependency management
+    - Dependency management via a topological (Kahn) scheduler
     - Human-in-the-loop gates
     - State tracking
     """
     
-    def __init__(self, verbose: bool = False):
+    def __init__(
+        self,
+        verbose: bool = False,
+        max_workers: Optional[int] = None,
+        cpu_workers: Optional[int] = None
+    ):
         """
         Initialize the task engine.
         
         Args:
             verbose: Enable verbose output
+            max_workers: Maximum number of worker threads for parallel
+                sub-tasks (default: min(32, cpu_count + 4))
+            cpu_workers: Maximum number of worker processes for actions of
+                ``cpu_bound`` tasks (default: cpu_count)
         """
         self.verbose = verbose
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        
+        # Started on the first cpu_bound action; most runs never need it
+        self.proc_pool: Optional[ProcessPoolExecutor] = None
+        self._proc_pool_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="loom-worker"
+        )
         self.root_node: Optional[TaskNode] = None
-        self.all_nodes: Dict[str, TaskNode] = {}
-        self.completed_count = 0
+        self.all_nodes: Dict[str, TaskNode] = ThreadSafeDict()
+        
+        # Tree structure by id, filled by _build_task_tree for serialization
+        self.parent_ids: Dict[str, str] = {}
+        self.child_ids: Dict[str, List[str]] = {}
+        # task_path -> node, built on first find_node() and dropped whenever
+        # the tree is rebuilt
+        self._path_index: Optional[Dict[str, TaskNode]] = None
+        # Ids of nodes that completed or failed, in order; deque.append is
+        # atomic, so finishing a task takes no lock
+        self._done: deque = deque()
         self.total_count = 0
         self.lock = threading.Lock()
-        self.human_gate_events: Dict[str, threading.Event] = {}
+        self.human_gate_events: Dict[str, threading.Event] = ThreadSafeDict()
+        
+        # DAG scheduling state, populated by _build_task_tree
+        self.in_degree: Dict[str, int] = {}
+        self.reverse_deps: Dict[str, List[str]] = {}
+        self.unmet_deps: Dict[str, int] = {}
+        self.dependents: Dict[str, List[str]] = {}
+        self.topological_order: List[str] = []
+        self._pending_children: Dict[str, int] = {}
+        
+        # Status of every node by node.index, mirrored from node.status so
+        # summaries scan one byte per node instead of the node objects
+        self.status_arr = array('b')
+        self._released: Set[str] = set()
+        self._finished: Set[str] = set()
+        
+        # Critical-path priorities; duration_estimates (seconds per node id)
+        # may be filled in before execute(), e.g. from a previous run
+        self.duration_estimates: Dict[str, float] = {}
+        self.upward_rank: Dict[str, float] = {}
+        
+        # Previous run's serialized nodes (set by resume) and the ids of
+        # nodes whose completed results are being reused
+        self.previous_nodes: Dict[str, Dict[str, Any]] = {}
+        self._resumed: Set[str] = set()
+        self._ready: List[Any] = []
+        self._ready_seq = itertools.count()
+        self._running = 0
+        self._error: Optional[BaseException] = None
+        self._cond = threading.Condition()
+        
+        # Set by the caller of execute() to stop dispatching new nodes
+        self._cancel_event: Optional[threading.Event] = None
+        
+        # Console output is queued and written by one background thread so
+        # workers never contend on the stdout lock
+        self._log_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._log_thread: Optional[threading.Thread] = None
+        
+        # Results of pure actions keyed by _action_key, least recently used first
+        self._action_cache: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._action_cache_lock = threading.Lock()
+        # Human gates waiting for the scheduler thread to prompt for them
+        self._gates: deque = deque()
         self.retry_manager = None
+        # Reads the answer to a human gate prompt; replaceable by hosts that
+        # can't block on stdin, such as the gevent web server
+        self.prompt: Callable[[str], str] = input
         self.timeout_manager = None
+        
+        # Called with each node whose status changes and the state_version of
+        # the change, from the thread that changed it; calls from different
+        # threads may arrive out of version order. Listeners must be quick and
+        # must not raise.
+        self.status_listeners: List[Callable[[TaskNode, int], None]] = []
+        
+        # Bumped on every status change; the most recent changes are kept as
+        # (version, node_id, fields) so clients can fetch just what changed
+        self.state_version = 0
+        self.deltas: deque = deque(maxlen=_DELTA_HISTORY)
+        self._delta_lock = threading.Lock()
+        
+        # Number of nodes currently in RUNNING, kept by _set_status
+        self.running_count = 0
+        
+        # Subclasses may implement _execute_action as a coroutine function;
+        # its timeouts are then enforced on the event loop instead of by
+        # timeout_manager's monitor thread
+        self._async_actions = inspect.iscoroutinefunction(self._execute_action)
+        self._async_timeouts = None
+        if self._async_actions:
+            from loom.timeout import AsyncTimeoutManager
+            self._async_timeouts = AsyncTimeoutManager()
     
-    def execute(self, config: Dict[str, Any]) -> None:
+    def deltas_since(self, version: int) -> Optional[List[Dict[str, Any]]]:
         """
-        Execute a task configuration.
+        Return the status changes made after a given state version.
         
         Args:
-            config: Task configuration dictionary
+            version: A state_version previously read from this engine
+            
+        Returns:
+            Changes in order, each a dict with the node ``id``, the change's
+            ``version`` and the node's new status fields, or None if the
+            version is unknown or too old to be covered by the retained
+            history
+        """
+        with self._delta_lock:
+            current = self.state_version
+            if version > current or version < current - len(self.deltas):
+                return None
+            count = current - version
+            recent = list(itertools.islice(reversed(self.deltas), count))
+        
+        recent.reverse()
+        return [
+            {"id": node_id, "version": change_version, **fields}
+            for change_version, node_id, fields in recent
+        ]
+    
+    def status_counts(self) -> Dict[str, int]:
+        """
+        Count nodes by status.
+        
+        Counts come from the status column, one ``bytes.count`` scan per
+        status, without touching the node objects.
+        
+        Returns:
+            Dictionary mapping status name to count, in status order and
+            omitting statuses with no nodes
         """
-        print(f"\n{Fore.CYAN}{Style.BRIGHT}🧶 Loom: Starting Task Execution{Style.RESET_ALL}\n")
+        data = self.status_arr.tobytes()
+        counts = {}
+        for name, needle in zip(STATUS_NAMES, _STATUS_BYTES):
+            count = data.count(needle)
+            if count:
+                counts[name] = count
+        return counts
+    
+    @property
+    def completed_count(self) -> int:
+        """Number of tasks that have completed or failed so far."""
+        return len(self._done)
+    
+    def close(self) -> None:
+        """Shut down the worker pool, waiting for running tasks to finish."""
+        # Wake tasks sleeping before a retry so shutdown doesn't wait them out
+        if self.retry_manager is not None:
+            self.retry_manager.cancel()
         
-        # Build task tree
-        self.root_node = self._build_task_tree(config, parent=None)
+        self.executor.shutdown(wait=True)
         
-        # Count total tasks
-        self.total_count = self._count_tasks(self.root_node)
+        if self.proc_pool is not None:
+            self.proc_pool.shutdown(wait=True)
+            self.proc_pool = None
         
-        print(f"{Fore.GREEN}📊 Total tasks in tree: {self.total_count}{Style.RESET_ALL}\n")
+        if self._log_thread is not None:
+            self._log_queue.put(None)
+            self._log_thread.join()
+            self._log_thread = None
+    
+    def __enter__(self) -> "TaskEngine":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def execute(self, config: Dict[str, Any], cancel_event: Optional[threading.Event] = None) -> None:
+        """
+        Execute a task configuration.
+        
+        Once ``cancel_event`` is set no further nodes are started; nodes
+        already running finish, the ones waiting on their sub-tasks are
+        marked failed and the rest stay pending.
+        
+        Args:
+            config: Task configuration dictionary
+            cancel_event: Event that cancels the execution when set (optional)
+        """
+        self._cancel_event = cancel_event
+        self._start_log_writer()
+        self._emit(f"\n{Fore.CYAN}{Style.BRIGHT}🧶 Loom: Starting Task Execution{Style.RESET_ALL}\n")
         
-        # Execute root task
-        self._execute_node(self.root_node)
+        try:
+            # Build and count the task tree
+            self.total_count = 0
+            self.root_node = self._build_task_tree(config, parent=None)
+            
+            self._emit(f"{Fore.GREEN}📊 Total tasks in tree: {self.total_count}{Style.RESET_ALL}\n")
+            
+            # Reuse results of unchanged tasks that completed in a previous run
+            self._resumed = self._match_previous_nodes() if self.previous_nodes else set()
+            
+            # Schedule the whole tree as a dependency graph
+            self._run_dag()
+        finally:
+            self._flush_log()
         
         # Print final summary
         self._print_summary()
+        self._flush_log()
+    
+    def _start_log_writer(self) -> None:
+        """Start the background console writer if it isn't running."""
+        if self._log_thread is None:
+            self._log_thread = threading.Thread(
+                target=self._log_writer, name="loom-log", daemon=True
+            )
+            self._log_thread.start()
+    
+    def _log_writer(self) -> None:
+        """Drain the log queue, writing whatever is queued in one batch."""
+        log_queue = self._log_queue
+        running = True
+        while running:
+            batch = [log_queue.get()]
+            try:
+                while len(batch) < _LOG_BATCH:
+                    batch.append(log_queue.get_nowait())
+            except queue.Empty:
+                pass
+            
+            lines = [line for line in batch if line is not None]
+            running = len(lines) == len(batch)
+            try:
+                if lines:
+                    stream = sys.stdout
+                    stream.write("".join(lines))
+                    stream.flush()
+            except (OSError, ValueError):
+                # Closed or broken stdout; drop the output, keep draining
+                pass
+            finally:
+                for _ in batch:
+                    log_queue.task_done()
+    
+    def _emit(self, line: str = "") -> None:
+        """Queue a console line for the log writer."""
+        if self._log_thread is None:
+            print(line)
+        else:
+            self._log_queue.put(line + "\n")
+    
+    def _flush_log(self) -> None:
+        """Wait until every queued console line has been written."""
+        if self._log_thread is not None:
+            self._log_queue.join()
+    
+    def resume(
+        self,
+        config: Dict[str, Any],
+        execution_id: str,
+        state_manager: Optional[Any] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> None:
+        """
+        Execute a task configuration, reusing a previous execution's results.
+        
+        Tasks that completed in the previous run and whose definition
+        (task, action, dependencies and sub-task ids) is unchanged are not
+        executed again, unless a task they depend on runs again. Recorded
+        durations feed the scheduler's priorities.
+        
+        Args:
+            config: Task configuration dictionary
+            execution_id: Identifier of the saved execution to resume
+            state_manager: StateManager to load the state from (optional)
+            cancel_event: Event that cancels the execution when set (optional)
+            
+        Raises:
+            ValueError: If no state is saved for the execution
+        """
+        if state_manager is None:
+            from loom.state import StateManager
+            state_manager = StateManager()
+        
+        state = state_manager.load_state(execution_id)
+        if not state:
+            raise ValueError(f"State not found for execution: {execution_id}")
+        
+        self.previous_nodes = state.get("nodes", {})
+        self.duration_estimates = state_manager.load_durations(execution_id)
+        
+        self.execute(config, cancel_event)
+    
+    def _match_previous_nodes(self) -> Set[str]:
+        """
+        Find nodes that completed in the previous run with the same definition.
+        
+        A node is only reused if every task it depends on, directly or
+        transitively, is reused too; a dependency that re-runs may produce
+        a different result. ``topological_order`` lists dependencies first,
+        so one pass is enough.
+        
+        Returns:
+            Set of node ids whose previous results can be reused
+        """
+        from loom.utils import calculate_node_hash
+        
+        all_nodes = self.all_nodes
+        matched = set()
+        for node_id in self.topological_order:
+            node = all_nodes[node_id]
+            previous = self.previous_nodes.get(node_id)
+            if not previous or previous.get("status") != STATUS_NAMES[TaskStatus.COMPLETED]:
+                continue
+            if any(dep_id not in matched for dep_id in node.depends_on):
+                continue
+            
+            current_hash = calculate_node_hash(
+                node.task, node.action, node.depends_on,
+                [sub_task.id for sub_task in node.sub_tasks]
+            )
+            previous_hash = calculate_node_hash(
+                previous.get("task", ""), previous.get("action", ""),
+                previous.get("depends_on", []), previous.get("sub_task_ids", [])
+            )
+            if current_hash == previous_hash:
+                matched.add(node_id)
+        
+        return matched
     
     def _build_task_tree(self, config: Dict[str, Any], parent: Optional[TaskNode] = None) -> TaskNode:
         """
-        Recursively build the task tree from configuration.
+        Build the task tree from configuration in a single iterative pass.
+        
+        Nodes are registered in pre-order and counted into ``total_count``
+        as they are created.
         
         Args:
             config: Task configuration
@@ -111,119 +502,556 @@ class TaskEngine:
         Returns:
             Constructed task node
         """
-        node_id = config.get("id", "root" if parent is None else f"task_{len(self.all_nodes)}")
-        
-        node = TaskNode(
-            id=node_id,
-            task=config["task"],
-            action=config.get("action", ""),
-            parallel=config.get("parallel", False),
-            human_gate=config.get("human_gate", False),
-            depends_on=config.get("depends_on", []),
-            sub_tasks=[],
-            parent=parent
-        )
+        if parent is None:
+            # A new tree replaces whatever the previous execute() built
+            self.all_nodes.clear()
+            self.parent_ids.clear()
+            self.child_ids.clear()
+            self._done.clear()
         
-        # Set task path
-        if parent:
-            node.task_path = f"{parent.task_path}/{node_id}"
-        else:
-            node.task_path = node_id
+        all_nodes = self.all_nodes
+        parent_ids = self.parent_ids
+        child_ids = self.child_ids
+        self._path_index = None
+        root = None
+        stack = [(config, parent)]
+        
+        while stack:
+            node_config, node_parent = stack.pop()
+            _get = node_config.get
+            
+            if "id" in node_config:
+                node_id = node_config["id"]
+            else:
+                node_id = "root" if node_parent is None else sys.intern(f"task_{len(all_nodes)}")
+            
+            node = TaskNode(
+                id=node_id,
+                task=node_config["task"],
+                action=_get("action", ""),
+                parallel=_get("parallel", False),
+                human_gate=_get("human_gate", False),
+                depends_on=_get("depends_on", []),
+                sub_tasks=[],
+                parent=node_parent,
+                timeout=_get("timeout"),
+                pure=_get("pure", False),
+                cpu_bound=_get("cpu_bound", False)
+            )
+            
+            # Register node
+            all_nodes[node_id] = node
+            self.total_count += 1
+            
+            if node_parent is not None:
+                parent_ids[node_id] = node_parent.id
+                child_ids.setdefault(node_parent.id, []).append(node_id)
+            
+            if root is None:
+                root = node
+            elif node_parent is not None:
+                node_parent.sub_tasks.append(node)
+            
+            # Push sub-tasks reversed so they pop in declaration order
+            sub_configs = _get("sub_tasks")
+            if sub_configs:
+                stack.extend((sub_config, node) for sub_config in reversed(sub_configs))
+        
+        if parent is None:
+            self._validate_dag()
+            self._build_dependency_graph()
+        
+        return root
+    
+    def find_node(self, task_path: str) -> Optional[TaskNode]:
+        """
+        Look up a node of the current tree by its task path.
+        
+        Args:
+            task_path: Slash-separated task path, e.g. "root/api_gen"
+            
+        Returns:
+            The node, or None if no node has that path
+        """
+        if self.root_node is None:
+            return None
+        if self._path_index is None:
+            self._path_index = build_path_index(self.root_node)
+        return self._path_index.get(task_path)
+    
+    def _validate_dag(self) -> None:
+        """
+        Check ``depends_on`` references once, before anything runs.
         
-        # Register node
-        self.all_nodes[node_id] = node
+        Runs Kahn's algorithm over the dependency edges and stores the
+        resulting order in ``topological_order``. Depending on one's own
+        ancestor also counts as a cycle, since an ancestor only completes
+        after all of its sub-tasks.
         
-        # Build sub-tasks
-        for sub_config in config.get("sub_tasks", []):
-            sub_node = self._build_task_tree(sub_config, parent=node)
-            node.sub_tasks.append(sub_node)
+        Raises:
+            UnknownDependency: If a task depends on an id that doesn't exist
+            CycleError: If the dependencies can never all be satisfied
+        """
+        all_nodes = self.all_nodes
+        in_degree = dict.fromkeys(all_nodes, 0)
+        dependents: Dict[str, List[str]] = {}
         
-        return node
+        for node_id, node in all_nodes.items():
+            if not node.depends_on:
+                continue
+            
+            ancestors = set()
+            ancestor = node.parent
+            while ancestor is not None:
+                ancestors.add(ancestor.id)
+                ancestor = ancestor.parent
+            
+            for dep_id in node.depends_on:
+                if dep_id not in all_nodes:
+                    raise UnknownDependency(dep_id, node_id)
+                if dep_id in ancestors or dep_id == node_id:
+                    raise CycleError([node_id] if dep_id == node_id else [node_id, dep_id])
+                in_degree[node_id] += 1
+                dependents.setdefault(dep_id, []).append(node_id)
+        
+        ready = deque(node_id for node_id, degree in in_degree.items() if degree == 0)
+        order = []
+        while ready:
+            node_id = ready.popleft()
+            order.append(node_id)
+            for dependent_id in dependents.get(node_id, ()):
+                in_degree[dependent_id] -= 1
+                if in_degree[dependent_id] == 0:
+                    ready.append(dependent_id)
+        
+        if len(order) < len(all_nodes):
+            raise CycleError([node_id for node_id, degree in in_degree.items() if degree > 0])
+        
+        self.topological_order = order
     
-    def _count_tasks(self, node: TaskNode) -> int:
-        """Recursively count all tasks in the tree."""
-        count = 1
+    def _build_dependency_graph(self) -> None:
+        """
+        Derive scheduling edges from the built tree.
+        
+        A node may start once its parent's action has run, its previous
+        sibling has finished (for sequential parents) and every
+        ``depends_on`` task has finished. ``in_degree`` counts those
+        prerequisites and ``reverse_deps`` maps a node to the nodes waiting
+        on it to finish. Dependencies have already been checked by
+        ``_validate_dag``.
+        
+        ``unmet_deps`` separately counts the ``depends_on`` entries that have
+        not completed yet; it only reaches zero if every dependency succeeds.
+        """
+        self.in_degree = {}
+        self.reverse_deps = {}
+        self.unmet_deps = {}
+        self.dependents = {}
+        self._pending_children = {}
+        self.status_arr = array('b', bytes(len(self.all_nodes)))
+        
+        for index, (node_id, node) in enumerate(self.all_nodes.items()):
+            node.index = index
+            self.status_arr[index] = node.status
+            degree = 1 if node.parent else 0
+            self.unmet_deps[node_id] = len(node.depends_on)
+            for dep_id in node.depends_on:
+                degree += 1
+                self.reverse_deps.setdefault(dep_id, []).append(node_id)
+                self.dependents.setdefault(dep_id, []).append(node_id)
+            self.in_degree[node_id] = self.in_degree.get(node_id, 0) + degree
+            self._pending_children[node_id] = len(node.sub_tasks)
+            
+            if not node.parallel:
+                for prev, nxt in zip(node.sub_tasks, node.sub_tasks[1:]):
+                    self.in_degree[nxt.id] = self.in_degree.get(nxt.id, 0) + 1
+                    self.reverse_deps.setdefault(prev.id, []).append(nxt.id)
+        
+        self.running_count = self.status_arr.count(TaskStatus.RUNNING)
+        self._compute_priorities()
+    
+    def _successors(self, node: TaskNode) -> List[str]:
+        """
+        Return the ids of nodes that cannot finish before this node does.
+        
+        These are its sub-tasks, the nodes waiting on it and, because a node
+        gates its parent's completion, the nodes waiting on its ancestors.
+        """
+        successors = [sub_task.id for sub_task in node.sub_tasks]
+        current = node
+        while current is not None:
+            successors.extend(self.reverse_deps.get(current.id, ()))
+            current = current.parent
+        return successors
+    
+    def _compute_priorities(self) -> None:
+        """
+        Compute each node's upward rank (HLFET critical-path priority).
+        
+        ``upward_rank[n]`` is the estimated duration of ``n`` plus the
+        largest rank among its successors, so the ready queue favours nodes
+        on the longest remaining path. Unknown durations count as 1.0;
+        edges that would close a cycle are ignored.
+        """
+        estimates = self.duration_estimates
+        all_nodes = self.all_nodes
+        rank: Dict[str, float] = {}
+        successors: Dict[str, List[str]] = {}
+        in_progress: Set[str] = set()
+        
+        for start_id in all_nodes:
+            if start_id in rank:
+                continue
+            
+            # Iterative post-order DFS over the successor graph
+            stack = [(start_id, False)]
+            while stack:
+                node_id, expanded = stack.pop()
+                if expanded:
+                    in_progress.discard(node_id)
+                    rank[node_id] = estimates.get(node_id, 1.0) + max(
+                        (rank.get(succ_id, 0.0) for succ_id in successors.pop(node_id)),
+                        default=0.0
+                    )
+                    continue
+                
+                if node_id in rank or node_id in in_progress:
+                    continue
+                
+                in_progress.add(node_id)
+                stack.append((node_id, True))
+                succ_ids = successors[node_id] = self._successors(all_nodes[node_id])
+                for succ_id in succ_ids:
+                    if succ_id not in rank and succ_id not in in_progress:
+                        stack.append((succ_id, False))
+        
+        self.upward_rank = rank
+    
+    def _run_dag(self) -> None:
+        """
+        Execute the task tree with a Kahn-style topological scheduler.
+        
+        Nodes whose prerequisites have all finished are dispatched to the
+        worker pool as soon as they become ready, so independent branches
+        anywhere in the tree overlap. Workers submit the nodes they unblock
+        themselves; this thread only seeds the pool, prompts for human
+        gates and steps in once the pool drains, to block stalled nodes or
+        finish.
+        """
+        with self._cond:
+            self._released = set()
+            self._finished = set()
+            self._running = 0
+            self._error = None
+            self._ready = []
+            self._gates.clear()
+            for node_id, degree in self.in_degree.items():
+                if degree == 0:
+                    self._push_ready(node_id)
+            
+            try:
+                while True:
+                    self._submit_ready()
+                    
+                    if self._gates:
+                        self._answer_gate(self._gates.popleft())
+                        continue
+                    
+                    if self._running:
+                        self._cond.wait()
+                        continue
+                    
+                    if self._cancelled():
+                        self._abandon_running()
+                        break
+                    
+                    if self._error is not None or not self._block_stalled():
+                        break
+            except BaseException as e:
+                # E.g. Ctrl-C at a gate prompt: start nothing new and turn
+                # away the gates still waiting, so the workers can finish
+                if self._error is None:
+                    self._error = e
+                while self._gates:
+                    self._gates.popleft().answered.set()
+                raise
+        
+        if self._error is not None:
+            raise self._error
+    
+    def _cancelled(self) -> bool:
+        """Whether the caller has asked for execution to stop."""
+        return self._cancel_event is not None and self._cancel_event.is_set()
+    
+    def _abandon_running(self) -> None:
+        """Fail nodes still waiting on sub-tasks after a cancel (lock held)."""
+        now = time.time()
+        for node in self.all_nodes.values():
+            if node.status == TaskStatus.RUNNING:
+                node.error = "Execution cancelled"
+                node.end_time = now
+                self._set_status(node, TaskStatus.FAILED)
+                self._done.append(node.id)
+        self._emit(f"{Fore.YELLOW}⏹️  Execution cancelled{Style.RESET_ALL}")
+    
+    def _answer_gate(self, request: _GateRequest) -> None:
+        """
+        Prompt for a worker's human gate and hand back the answer (lock held).
+        
+        The lock is released while the prompt waits for input. Gates
+        reached after a failure or cancel are rejected without prompting.
+        """
+        try:
+            if self._error is None and not self._cancelled():
+                self._cond.release()
+                try:
+                    request.approved = self._handle_human_gate(request.node)
+                finally:
+                    self._cond.acquire()
+        finally:
+            request.answered.set()
+    
+    def _pass_gate(self, node: TaskNode) -> bool:
+        """
+        Have the scheduler thread prompt for a node's human gate.
+        
+        Prompts are read on the thread that called execute(), one at a
+        time, so an interrupt at the prompt reaches the caller.
+        
+        Returns:
+            True if the gate was approved
+        """
+        request = _GateRequest(node)
+        with self._cond:
+            if self._error is not None or self._cancelled():
+                return False
+            self._gates.append(request)
+            self._cond.notify()
+        request.answered.wait()
+        return request.approved
+    
+    def _submit_ready(self) -> None:
+        """Hand every queued ready node to the worker pool (lock held)."""
+        if self._cancelled():
+            return
+        while self._ready and self._error is None:
+            node = self.all_nodes[heapq.heappop(self._ready)[2]]
+            self._running += 1
+            self.executor.submit(self._dispatch, node)
+    
+    def _dispatch(self, node: TaskNode) -> None:
+        """Run one ready node on a worker and feed the outcome back to the scheduler."""
+        error = None
+        try:
+            started = self._execute_node(node)
+        except BaseException as e:
+            started = False
+            error = e
+        
+        with self._cond:
+            self._running -= 1
+            if error is not None:
+                self._fail_ancestors(node, error)
+                if self._error is None:
+                    self._error = error
+            elif started:
+                self._release_children(node)
+            else:
+                self._finish(node)
+            
+            self._submit_ready()
+            if not self._running:
+                self._cond.notify()
+    
+    def _release_children(self, node: TaskNode) -> None:
+        """Unblock a node's sub-tasks once its own action has run (lock held)."""
+        self._released.add(node.id)
+        if not node.sub_tasks:
+            self._complete_node(node)
+            return
         for sub_task in node.sub_tasks:
-            count += self._count_tasks(sub_task)
-        return count
+            self._decrement(sub_task.id)
+    
+    def _decrement(self, node_id: str) -> None:
+        """Drop one prerequisite of a node, queuing it when none remain (lock held)."""
+        self.in_degree[node_id] -= 1
+        if self.in_degree[node_id] == 0:
+            self._push_ready(node_id)
+    
+    def _push_ready(self, node_id: str) -> None:
+        """Queue a ready node, longest remaining critical path first (lock held)."""
+        heapq.heappush(
+            self._ready,
+            (-self.upward_rank.get(node_id, 0.0), next(self._ready_seq), node_id)
+        )
     
-    def _execute_node(self, node: TaskNode) -> None:
+    def _complete_node(self, node: TaskNode) -> None:
+        """Mark a node whose action and sub-tasks are done as completed (lock held)."""
+        node.end_time = time.time()
+        self._set_status(node, TaskStatus.COMPLETED)
+        
+        self._done.append(node.id)
+        for dependent_id in self.dependents.get(node.id, ()):
+            self.unmet_deps[dependent_id] -= 1
+        
+        self._log_task_complete(node)
+        self._finish(node)
+    
+    def _finish(self, node: TaskNode) -> None:
+        """Record that a node reached a final state and propagate it (lock held)."""
+        self._finished.add(node.id)
+        
+        for dependent_id in self.reverse_deps.get(node.id, ()):
+            self._decrement(dependent_id)
+        
+        parent = node.parent
+        if parent is not None:
+            self._pending_children[parent.id] -= 1
+            if self._pending_children[parent.id] == 0:
+                self._complete_node(parent)
+    
+    def _fail_ancestors(self, node: TaskNode, error: BaseException) -> None:
+        """Mark running ancestors of a node whose error aborts execution (lock held)."""
+        parent = node.parent
+        while parent is not None and parent.status == TaskStatus.RUNNING:
+            parent.error = str(error)
+            parent.end_time = time.time()
+            self._set_status(parent, TaskStatus.FAILED)
+            self._done.append(parent.id)
+            
+            self._log_task_error(parent, error)
+            parent = parent.parent
+    
+    def _block_stalled(self) -> bool:
+        """
+        Block nodes that can only be waiting on dependencies that will never
+        complete, e.g. a dependency on their own descendant (lock held).
+        
+        Returns:
+            True if any node was blocked and scheduling can continue
         """
-        Execute a single task node.
+        stalled = []
+        for node_id, node in self.all_nodes.items():
+            if node_id in self._finished or node.status != TaskStatus.PENDING:
+                continue
+            parent = node.parent
+            if parent is not None and parent.id not in self._released:
+                continue
+            if parent is not None and not parent.parallel:
+                index = parent.sub_tasks.index(node)
+                if index and parent.sub_tasks[index - 1].id not in self._finished:
+                    continue
+            stalled.append(node)
+        
+        for node in stalled:
+            self._set_status(node, TaskStatus.BLOCKED)
+            if self.verbose:
+                self._emit(f"{Fore.YELLOW}⏸️  [{node.task_path}] Blocked by dependencies{Style.RESET_ALL}")
+            self._finish(node)
+        
+        return bool(stalled)
+    
+    def _execute_node(self, node: TaskNode) -> bool:
+        """
+        Execute a single task node's gate and action.
+        
+        Sub-tasks are scheduled separately once this returns True.
         
         Args:
             node: Task node to execute
+            
+        Returns:
+            True if the node ran and its sub-tasks may start, False if it
+            was blocked, rejected at its gate or failed
         """
         # Check dependencies
         if not self._check_dependencies(node):
-            node.status = TaskStatus.BLOCKED
+            self._set_status(node, TaskStatus.BLOCKED)
             if self.verbose:
-                print(f"{Fore.YELLOW}⏸️  [{node.task_path}] Blocked by dependencies{Style.RESET_ALL}")
-            return
+                self._emit(f"{Fore.YELLOW}⏸️  [{node.task_path}] Blocked by dependencies{Style.RESET_ALL}")
+            return False
+        
+        # Reuse the previous run's result; sub-tasks are still checked individually
+        if node.id in self._resumed:
+            node.result = self.previous_nodes[node.id].get("result")
+            node.start_time = time.time()
+            if self.verbose:
+                self._emit(f"{Fore.CYAN}⏭️  [{node.task_path}] Reusing result from previous run{Style.RESET_ALL}")
+            return True
         
         # Handle human gate
-        if node.human_gate:
-            if not self._handle_human_gate(node):
-                return
+        if node.human_gate and not self._pass_gate(node):
+            return False
         
-        # Update status
-        node.status = TaskStatus.RUNNING
+        # Update status; fields are set before the status so that status
+        # listeners see them
         node.start_time = time.time()
+        self._set_status(node, TaskStatus.RUNNING)
         
         self._log_task_start(node)
         
         try:
             # Execute action with timeout if configured
             if node.action:
-                if self.timeout_manager:
+                if self.timeout_manager and not self._async_actions:
                     with self.timeout_manager.timeout_context(
-                        getattr(node, 'timeout', None),
+                        node.timeout,
                         node.id
                     ):
-                        result = self._execute_action(node)
+                        result = self._run_action(node)
                         node.result = result
                 else:
-                    result = self._execute_action(node)
+                    result = self._run_action(node)
                     node.result = result
             
-            # Execute sub-tasks
-            if node.sub_tasks:
-                if node.parallel:
-                    self._execute_parallel_subtasks(node)
-                else:
-                    self._execute_sequential_subtasks(node)
-            
-            # Mark as completed
-            node.status = TaskStatus.COMPLETED
-            node.end_time = time.time()
-            
-            with self.lock:
-                self.completed_count += 1
-            
-            self._log_task_complete(node)
+            return True
             
         except Exception as e:
             # Check if we should retry
             if self.retry_manager and self.retry_manager.should_retry(node):
                 try:
-                    result = self.retry_manager.retry_task(node, self._execute_node)
-                    return
+                    return self.retry_manager.retry_task(node, self._execute_node)
                 except Exception as retry_error:
                     # Retry failed, mark as failed
                     pass
             
-            node.status = TaskStatus.FAILED
             node.error = str(e)
             node.end_time = time.time()
-            
-            with self.lock:
-                self.completed_count += 1
+            self._set_status(node, TaskStatus.FAILED)
+            self._done.append(node.id)
             
             self._log_task_error(node, e)
             
             # Don't raise if retry manager is handling it
             if not (self.retry_manager and self.retry_manager.should_retry(node)):
                 raise
+            return False
+    
+    def _set_status(self, node: TaskNode, status: TaskStatus) -> None:
+        """Update a node's status and its entry in the status column."""
+        previous = node.status
+        node.status = status
+        if node.index >= 0:
+            self.status_arr[node.index] = status
+        
+        fields = {
+            "status": STATUS_NAMES[status],
+            "start_time": node.start_time,
+            "end_time": node.end_time,
+            "error": node.error
+        }
+        with self._delta_lock:
+            self.state_version += 1
+            version = self.state_version
+            self.deltas.append((version, node.id, fields))
+            if previous is not status:
+                if status is TaskStatus.RUNNING:
+                    self.running_count += 1
+                elif previous is TaskStatus.RUNNING:
+                    self.running_count -= 1
+        
+        for listener in self.status_listeners:
+            listener(node, version)
     
     def _check_dependencies(self, node: TaskNode) -> bool:
         """
@@ -235,20 +1063,7 @@ class TaskEngine:
         Returns:
             True if all dependencies are satisfied
         """
-        if not node.depends_on:
-            return True
-        
-        for dep_id in node.depends_on:
-            if dep_id not in self.all_nodes:
-                if self.verbose:
-                    print(f"{Fore.RED}⚠️  Dependency '{dep_id}' not found{Style.RESET_ALL}")
-                return False
-            
-            dep_node = self.all_nodes[dep_id]
-            if dep_node.status != TaskStatus.COMPLETED:
-                return False
-        
-        return True
+        return self.unmet_deps.get(node.id, 0) == 0
     
     def _handle_human_gate(self, node: TaskNode) -> bool:
         """
@@ -260,7 +1075,10 @@ class TaskEngine:
         Returns:
             True if gate is passed, False otherwise
         """
-        node.status = TaskStatus.WAITING_HUMAN
+        self._set_status(node, TaskStatus.WAITING_HUMAN)
+        
+        # The prompt must not overtake queued log lines
+        self._flush_log()
         
         print(f"\n{Fore.YELLOW}{Style.BRIGHT}⏸️  HUMAN GATE: {node.task_path}{Style.RESET_ALL}")
         print(f"{Fore.CYAN}Task: {node.task}{Style.RESET_ALL}")
@@ -270,7 +1088,7 @@ class TaskEngine:
         if node.sub_tasks:
             print(f"{Fore.CYAN}Sub-tasks: {len(node.sub_tasks)}{Style.RESET_ALL}")
         
-        response = input(f"\n{Fore.GREEN}Proceed? (y/n/edit): {Style.RESET_ALL}").strip().lower()
+        response = self.prompt(f"\n{Fore.GREEN}Proceed? (y/n/edit): {Style.RESET_ALL}").strip().lower()
         
         if response == 'n':
             print(f"{Fore.RED}❌ Gate rejected. Stopping execution.{Style.RESET_ALL}")
@@ -281,9 +1099,9 @@ class TaskEngine:
         
         return True
     
-    def _execute_action(self, node: TaskNode) -> Any:
+    def _run_action(self, node: TaskNode) -> Any:
         """
-        Execute the action for a task node.
+        Execute a node's action, reusing earlier results for pure tasks.
         
         Args:
             node: Task node to execute
@@ -291,71 +1109,109 @@ class TaskEngine:
         Returns:
             Action result
         """
-        # In a real implementation, this would integrate with AI models
-        # For now, we simulate execution
-        if self.verbose:
-            print(f"{Fore.BLUE}   Executing action: {node.action}{Style.RESET_ALL}")
+        if not node.pure:
+            return self._call_action(node)
+        
+        key = self._action_key(node)
+        with self._action_cache_lock:
+            if key in self._action_cache:
+                self._action_cache.move_to_end(key)
+                return self._action_cache[key]
+        
+        result = self._call_action(node)
         
-        # Simulate work
-        time.sleep(0.1)
+        with self._action_cache_lock:
+            self._action_cache[key] = result
+            if len(self._action_cache) > _ACTION_CACHE_SIZE:
+                self._action_cache.popitem(last=False)
         
-        return {"status": "executed", "action": node.action}
+        return result
     
-    def _execute_parallel_subtasks(self, node: TaskNode) -> None:
+    def _call_action(self, node: TaskNode) -> Any:
         """
-        Execute sub-tasks in parallel.
+        Call _execute_action, driving it to completion if it is async.
+        
+        Coroutine actions run on a short-lived event loop in the calling
+        worker thread, with the node's timeout (or the timeout manager's
+        default) enforced by cancellation.
         
         Args:
-            node: Parent task node
+            node: Task node to execute
+            
+        Returns:
+            Action result
         """
-        threads = []
-        
-        for sub_task in node.sub_tasks:
-            thread = threading.Thread(target=self._execute_node, args=(sub_task,))
-            thread.start()
-            threads.append(thread)
+        if not self._async_actions:
+            return self._execute_action(node)
         
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+        timeout = node.timeout
+        if timeout is None and self.timeout_manager is not None:
+            timeout = self.timeout_manager.default_timeout
+        return asyncio.run(self._async_timeouts.run(self._execute_action(node), timeout, node.id))
     
-    def _execute_sequential_subtasks(self, node: TaskNode) -> None:
+    @staticmethod
+    def _action_key(node: TaskNode) -> bytes:
+        """Return the cache key identifying a pure node's action inputs."""
+        parts = "\0".join([node.task, node.action, *sorted(node.depends_on)])
+        return hashlib.blake2b(parts.encode("utf-8"), digest_size=16).digest()
+    
+    def _execute_action(self, node: TaskNode) -> Any:
         """
-        Execute sub-tasks sequentially.
+        Execute the action for a task node.
         
         Args:
-            node: Parent task node
+            node: Task node to execute
+            
+        Returns:
+            Action result
         """
-        for sub_task in node.sub_tasks:
-            self._execute_node(sub_task)
+        if self.verbose:
+            self._emit(f"{Fore.BLUE}   Executing action: {node.action}{Style.RESET_ALL}")
+        
+        payload = {
+            "id": node.id,
+            "task": node.task,
+            "action": node.action,
+            "task_path": node.task_path,
+            "depends_on": list(node.depends_on)
+        }
+        
+        # CPU-bound actions run in a worker process to sidestep the GIL; the
+        # calling worker thread just waits for the result
+        if node.cpu_bound:
+            return self._get_proc_pool().submit(execute_action, payload).result()
+        
+        return execute_action(payload)
+    
+    def _get_proc_pool(self) -> ProcessPoolExecutor:
+        """Return the process pool for cpu_bound actions, starting it if needed."""
+        with self._proc_pool_lock:
+            if self.proc_pool is None:
+                self.proc_pool = ProcessPoolExecutor(max_workers=self.cpu_workers)
+            return self.proc_pool
     
     def _log_task_start(self, node: TaskNode) -> None:
         """Log task start."""
         progress = (self.completed_count / self.total_count * 100) if self.total_count > 0 else 0
-        print(f"{Fore.GREEN}▶️  [{node.task_path}] {node.task} {Style.DIM}({progress:.1f}%){Style.RESET_ALL}")
+        self._emit(f"{_START_PREFIX}{node.task_path}] {node.task} {_DIM}({progress:.1f}%){_RESET}")
     
     def _log_task_complete(self, node: TaskNode) -> None:
         """Log task completion."""
         duration = node.end_time - node.start_time if node.end_time and node.start_time else 0
         progress = (self.completed_count / self.total_count * 100) if self.total_count > 0 else 0
-        print(f"{Fore.GREEN}✅ [{node.task_path}] Completed in {duration:.2f}s {Style.DIM}({progress:.1f}%){Style.RESET_ALL}")
+        self._emit(f"{_COMPLETE_PREFIX}{node.task_path}] Completed in {duration:.2f}s {_DIM}({progress:.1f}%){_RESET}")
     
     def _log_task_error(self, node: TaskNode, error: Exception) -> None:
         """Log task error."""
         progress = (self.completed_count / self.total_count * 100) if self.total_count > 0 else 0
-        print(f"{Fore.RED}❌ [{node.task_path}] Failed: {error} {Style.DIM}({progress:.1f}%){Style.RESET_ALL}")
+        self._emit(f"{_ERROR_PREFIX}{node.task_path}] Failed: {error} {_DIM}({progress:.1f}%){_RESET}")
     
     def _print_summary(self) -> None:
         """Print execution summary."""
-        print(f"\n{Fore.CYAN}{Style.BRIGHT}📊 Execution Summary{Style.RESET_ALL}")
-        print(f"{Fore.GREEN}Completed: {self.completed_count}/{self.total_count} tasks{Style.RESET_ALL}")
+        self._emit(f"\n{Fore.CYAN}{Style.BRIGHT}📊 Execution Summary{Style.RESET_ALL}")
+        self._emit(f"{Fore.GREEN}Completed: {self.completed_count}/{self.total_count} tasks{Style.RESET_ALL}")
         
         # Count by status
-        status_counts = {}
-        for node in self.all_nodes.values():
-            status = node.status.value
-            status_counts[status] = status_counts.get(status, 0) + 1
-        
-        for status, count in status_counts.items():
-            print(f"  {status}: {count}")
+        for name, count in self.status_counts().items():
+            self._emit(f"  {name}: {count}")
 
@@ -3,12 +3,21 @@ Logging module for Loom task execution.
 """
 
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
 from colorama import Fore, Style
 
+# Log file rotation: size of one file and number of rotated copies kept
+_LOG_FILE_MAX_BYTES = 10_000_000
+_LOG_FILE_BACKUPS = 5
+
+# Records buffered before the log file is written
+_LOG_BUFFER_RECORDS = 512
+
 
 class LoomLogger:
     """
@@ -36,6 +45,11 @@ class LoomLogger:
         # Clear existing handlers
         self.logger.handlers.clear()
         
+        # Handlers doing formatting and IO, run by the queue listener, and
+        # wrapped handlers that must be closed after them
+        handlers = []
+        self._closeables = []
+        
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
@@ -44,21 +58,53 @@ class LoomLogger:
             datefmt='%H:%M:%S'
         )
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
+        handlers.append(console_handler)
         
         # File handler
         if log_file:
             log_file = Path(log_file)
             log_file.parent.mkdir(parents=True, exist_ok=True)
             
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(logging.DEBUG)
+            rotating_handler = logging.handlers.RotatingFileHandler(
+                log_file,
+                maxBytes=_LOG_FILE_MAX_BYTES,
+                backupCount=_LOG_FILE_BACKUPS,
+                encoding='utf-8'
+            )
             file_formatter = logging.Formatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
                 datefmt='%Y-%m-%d %H:%M:%S'
             )
-            file_handler.setFormatter(file_formatter)
-            self.logger.addHandler(file_handler)
+            rotating_handler.setFormatter(file_formatter)
+            
+            # Buffer records so the file sees batched writes; errors flush
+            # straight away
+            file_handler = logging.handlers.MemoryHandler(
+                capacity=_LOG_BUFFER_RECORDS,
+                flushLevel=logging.ERROR,
+                target=rotating_handler
+            )
+            file_handler.setLevel(logging.DEBUG)
+            handlers.append(file_handler)
+            self._closeables.append(rotating_handler)
+        
+        # Callers only enqueue records; a listener thread formats and writes
+        # them, so worker threads never wait on stream or file locks
+        self._log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        self.logger.addHandler(logging.handlers.QueueHandler(self._log_queue))
+        self._handlers = handlers
+        self._listener = logging.handlers.QueueListener(
+            self._log_queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
+    
+    def close(self) -> None:
+        """Write out queued records and close the handlers."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+            for handler in self._handlers + self._closeables:
+                handler.close()
     
     def debug(self, message: str) -> None:
         """Log debug message."""
@@ -2,7 +2,9 @@
 Retry mechanism for failed tasks.
 """
 
-import time
+import itertools
+import threading
+from concurrent.futures import CancelledError
 from typing import Callable, Any, Optional, Dict
 from enum import Enum
 
@@ -44,6 +46,17 @@ class RetryManager:
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.retry_counts: Dict[str, int] = {}
+        
+        # One counter per node; next() on it is the atomic increment, so
+        # recording a retry needs no lock
+        self._counters: Dict[str, "itertools.count[int]"] = {}
+        
+        # Set on shutdown to wake tasks sleeping before a retry
+        self._cancel = threading.Event()
+    
+    def cancel(self) -> None:
+        """Abort pending retry delays; waiting and future retries raise CancelledError."""
+        self._cancel.set()
     
     def should_retry(self, node: TaskNode) -> bool:
         """
@@ -93,7 +106,8 @@ class RetryManager:
         Args:
             node: Task node being retried
         """
-        self.retry_counts[node.id] = self.retry_counts.get(node.id, 0) + 1
+        counter = self._counters.setdefault(node.id, itertools.count(1))
+        self.retry_counts[node.id] = next(counter)
     
     def reset_retry_count(self, node: TaskNode) -> None:
         """
@@ -102,8 +116,8 @@ class RetryManager:
         Args:
             node: Task node
         """
-        if node.id in self.retry_counts:
-            del self.retry_counts[node.id]
+        self._counters.pop(node.id, None)
+        self.retry_counts.pop(node.id, None)
     
     def get_retry_count(self, node: TaskNode) -> int:
         """
@@ -127,6 +141,9 @@ class RetryManager:
             
         Returns:
             Task result
+            
+        Raises:
+            CancelledError: If the manager was cancelled during the delay
         """
         if not self.should_retry(node):
             raise Exception(f"Task {node.id} exceeded max retries ({self.max_retries})")
@@ -137,7 +154,8 @@ class RetryManager:
         delay = self.get_retry_delay(node)
         if delay > 0:
             print(f"{Fore.YELLOW}⏳ Retrying [{node.task_path}] (attempt {retry_count}/{self.max_retries}) after {delay:.1f}s...{Style.RESET_ALL}")
-            time.sleep(delay)
+            if self._cancel.wait(delay):
+                raise CancelledError("engine shutdown")
         else:
             print(f"{Fore.YELLOW}🔄 Retrying [{node.task_path}] (attempt {retry_count}/{self.max_retries})...{Style.RESET_ALL}")
         
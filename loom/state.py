@@ -3,11 +3,35 @@ State persistence for Loom task execution.
 """
 
 import json
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
-from loom.engine import TaskNode, TaskStatus
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from loom.engine import STATUS_NAMES, TaskNode, TaskStatus
+
+
+# Most parsed state files a StateManager keeps in memory
+_STATE_CACHE_SIZE = 128
+
+# Shared stdlib encoder for _dumps; json.dumps would build a new encoder on
+# every call because of the non-default options
+_ENCODER = json.JSONEncoder(default=str, ensure_ascii=False, separators=(',', ':'))
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, using orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return _ENCODER.encode(obj).encode('utf-8')
 
 
 class StateManager:
@@ -24,13 +48,53 @@ class StateManager:
         """
         self.state_dir = Path(state_dir)
         self.state_dir.mkdir(exist_ok=True)
+        
+        # Parsed state files by path, most recently used last, each with the
+        # (mtime_ns, size) it was read at so rewritten files are reloaded
+        self._cache: "OrderedDict[str, Tuple[Tuple[int, int], Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    def _read_state(self, state_file: Path) -> Optional[Dict[str, Any]]:
+        """
+        Parse a state file, reusing the cached result while it is unchanged.
+        
+        Args:
+            state_file: Path to the state file
+            
+        Returns:
+            State dictionary or None if the file doesn't exist
+        """
+        try:
+            stat = os.stat(state_file)
+        except FileNotFoundError:
+            return None
+        
+        path = str(state_file)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._cache_lock:
+            cached = self._cache.get(path)
+            if cached is not None and cached[0] == stamp:
+                self._cache.move_to_end(path)
+                return cached[1]
+        
+        with open(state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        
+        with self._cache_lock:
+            self._cache[path] = (stamp, state)
+            if len(self._cache) > _STATE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        
+        return state
     
     def save_state(
         self,
         execution_id: str,
         root_node: TaskNode,
         all_nodes: Dict[str, TaskNode],
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        parent_ids: Optional[Dict[str, str]] = None,
+        child_ids: Optional[Dict[str, List[str]]] = None
     ) -> Path:
         """
         Save execution state to disk.
@@ -40,27 +104,40 @@ class StateManager:
             root_node: Root task node
             all_nodes: Dictionary of all nodes
             metadata: Additional metadata to save
+            parent_ids: Parent id by node id, as kept by TaskEngine (optional;
+                derived from the nodes if omitted)
+            child_ids: Sub-task ids by node id, as kept by TaskEngine
+                (optional; derived from the nodes if omitted)
             
         Returns:
             Path to saved state file
         """
         state_file = self.state_dir / f"{execution_id}.state"
         
-        # Serialize nodes (convert to dict for JSON)
-        nodes_data = {}
-        for node_id, node in all_nodes.items():
-            nodes_data[node_id] = self._serialize_node(node)
+        if parent_ids is None or child_ids is None:
+            parent_ids, child_ids = self._structure_maps(all_nodes)
         
-        state = {
+        header = {
             "execution_id": execution_id,
             "timestamp": datetime.now().isoformat(),
             "root_node_id": root_node.id,
-            "nodes": nodes_data,
             "metadata": metadata or {}
         }
         
-        with open(state_file, 'w', encoding='utf-8') as f:
-            json.dump(state, f, indent=2, default=str)
+        # Stream the nodes one at a time instead of building the whole state
+        # dict first; the result is still a single JSON object
+        with open(state_file, 'wb') as f:
+            write = f.write
+            write(_dumps(header)[:-1])
+            write(b',"nodes":{')
+            separator = b'\n'
+            for node_id, node in all_nodes.items():
+                write(separator)
+                write(_dumps(node_id))
+                write(b':')
+                write(_dumps(self._serialize_node(node, parent_ids, child_ids)))
+                separator = b',\n'
+            write(b'\n}}\n')
         
         return state_file
     
@@ -68,21 +145,41 @@ class StateManager:
         """
         Load execution state from disk.
         
+        Parsed states are cached until the file changes, so treat the
+        returned dictionary as read-only.
+        
         Args:
             execution_id: Execution identifier
             
         Returns:
             State dictionary or None if not found
         """
-        state_file = self.state_dir / f"{execution_id}.state"
+        return self._read_state(self.state_dir / f"{execution_id}.state")
+    
+    def load_durations(self, execution_id: str) -> Dict[str, float]:
+        """
+        Load recorded task durations from a saved execution.
         
-        if not state_file.exists():
-            return None
+        Args:
+            execution_id: Execution identifier
+            
+        Returns:
+            Dictionary mapping node id to duration in seconds; nodes that
+            never finished are left out
+        """
+        state = self.load_state(execution_id)
         
-        with open(state_file, 'r', encoding='utf-8') as f:
-            state = json.load(f)
+        if not state:
+            return {}
         
-        return state
+        durations = {}
+        for node_id, node_data in state.get("nodes", {}).items():
+            start_time = node_data.get("start_time")
+            end_time = node_data.get("end_time")
+            if start_time is not None and end_time is not None:
+                durations[node_id] = max(0.0, end_time - start_time)
+        
+        return durations
     
     def list_states(self) -> List[Dict[str, Any]]:
         """
@@ -95,8 +192,8 @@ class StateManager:
         
         for state_file in self.state_dir.glob("*.state"):
             try:
-                with open(state_file, 'r', encoding='utf-8') as f:
-                    state = json.load(f)
+                state = self._read_state(state_file)
+                if state is not None:
                     states.append({
                         "execution_id": state.get("execution_id", state_file.stem),
                         "timestamp": state.get("timestamp", "unknown"),
@@ -121,29 +218,55 @@ class StateManager:
         """
         state_file = self.state_dir / f"{execution_id}.state"
         
+        with self._cache_lock:
+            self._cache.pop(str(state_file), None)
+        
         if state_file.exists():
             state_file.unlink()
             return True
         
         return False
     
-    def _serialize_node(self, node: TaskNode) -> Dict[str, Any]:
+    @staticmethod
+    def _structure_maps(
+        all_nodes: Dict[str, TaskNode]
+    ) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+        """Build parent-id and sub-task-id maps from node references."""
+        parent_ids = {}
+        child_ids = {}
+        for node_id, node in all_nodes.items():
+            if node.parent is not None:
+                parent_ids[node_id] = node.parent.id
+            if node.sub_tasks:
+                child_ids[node_id] = [sub_task.id for sub_task in node.sub_tasks]
+        return parent_ids, child_ids
+    
+    def _serialize_node(
+        self,
+        node: TaskNode,
+        parent_ids: Optional[Dict[str, str]] = None,
+        child_ids: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, Any]:
         """Serialize a task node to dictionary."""
+        if parent_ids is None or child_ids is None:
+            parent_ids, child_ids = self._structure_maps({node.id: node})
+        
+        node_id = node.id
         return {
-            "id": node.id,
+            "id": node_id,
             "task": node.task,
             "action": node.action,
             "parallel": node.parallel,
             "human_gate": node.human_gate,
             "depends_on": node.depends_on,
-            "status": node.status.value if hasattr(node.status, 'value') else str(node.status),
+            "status": STATUS_NAMES[node.status],
             "task_path": node.task_path,
-            "parent_id": node.parent.id if node.parent else None,
+            "parent_id": parent_ids.get(node_id),
             "start_time": node.start_time,
             "end_time": node.end_time,
             "result": node.result,
             "error": node.error,
-            "sub_task_ids": [st.id for st in node.sub_tasks]
+            "sub_task_ids": child_ids.get(node_id, [])
         }
     
     def export_results(self, execution_id: str, output_path: Path) -> Path:
@@ -0,0 +1,27 @@
+"""
+Task status values shared by the engine and the utility helpers.
+"""
+
+from enum import IntEnum
+
+
+class TaskStatus(IntEnum):
+    """
+    Task execution status.
+    
+    Members are small ints so they can be stored directly in the engine's
+    status column; ``STATUS_NAMES[status]`` gives the serialized name.
+    """
+    PENDING = 0
+    RUNNING = 1
+    COMPLETED = 2
+    FAILED = 3
+    BLOCKED = 4
+    WAITING_HUMAN = 5
+    
+    def __str__(self) -> str:
+        return STATUS_NAMES[self]
+
+
+# Status names as written to state files and the web API, indexed by status
+STATUS_NAMES = ("pending", "running", "completed", "failed", "blocked", "waiting_human")
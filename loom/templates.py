@@ -2,6 +2,7 @@
 Task template generators for common patterns.
 """
 
+import sys
 from typing import Dict, Any, List, Optional
 
 
@@ -16,20 +17,18 @@ def generate_parallel_template(task_name: str, subtasks: List[str]) -> Dict[str,
     Returns:
         Task configuration dictionary
     """
-    template = {
+    return {
         "task": task_name,
         "parallel": True,
-        "sub_tasks": []
+        "sub_tasks": [
+            {
+                "id": sys.intern(f"task_{i}"),
+                "task": subtask_name,
+                "action": f"Execute {subtask_name}"
+            }
+            for i, subtask_name in enumerate(subtasks, 1)
+        ]
     }
-    
-    for i, subtask_name in enumerate(subtasks):
-        template["sub_tasks"].append({
-            "id": f"task_{i+1}",
-            "task": subtask_name,
-            "action": f"Execute {subtask_name}"
-        })
-    
-    return template
 
 
 def generate_sequential_template(task_name: str, subtasks: List[str]) -> Dict[str, Any]:
@@ -43,28 +42,20 @@ def generate_sequential_template(task_name: str, subtasks: List[str]) -> Dict[st
     Returns:
         Task configuration dictionary
     """
-    template = {
+    # Each task depends on the one before it
+    return {
         "task": task_name,
         "parallel": False,
-        "sub_tasks": []
+        "sub_tasks": [
+            {
+                "id": sys.intern(f"task_{i}"),
+                "task": subtask_name,
+                "action": f"Execute {subtask_name}",
+                **({"depends_on": [sys.intern(f"task_{i - 1}")]} if i > 1 else {})
+            }
+            for i, subtask_name in enumerate(subtasks, 1)
+        ]
     }
-    
-    prev_id = None
-    for i, subtask_name in enumerate(subtasks):
-        task_id = f"task_{i+1}"
-        task_config = {
-            "id": task_id,
-            "task": subtask_name,
-            "action": f"Execute {subtask_name}"
-        }
-        
-        if prev_id:
-            task_config["depends_on"] = [prev_id]
-        
-        template["sub_tasks"].append(task_config)
-        prev_id = task_id
-    
-    return template
 
 
 def generate_pipeline_template(
@@ -81,32 +72,76 @@ def generate_pipeline_template(
     Returns:
         Task configuration dictionary
     """
-    template = {
+    # Each stage depends on the one before it; with gates, every stage
+    # after the first also waits for approval
+    return {
         "task": "Pipeline Execution",
         "parallel": False,
-        "sub_tasks": []
+        "sub_tasks": [
+            {
+                "id": sys.intern(f"stage_{i}"),
+                "task": stage.get("name", f"Stage {i}"),
+                "action": stage.get("action", ""),
+                "parallel": stage.get("parallel", False),
+                **({"depends_on": [sys.intern(f"stage_{i - 1}")]} if i > 1 else {}),
+                **({"human_gate": True} if with_gates and i > 1 else {})
+            }
+            for i, stage in enumerate(stages, 1)
+        ]
     }
-    
-    prev_id = None
-    for i, stage in enumerate(stages):
-        stage_id = f"stage_{i+1}"
-        stage_config = {
-            "id": stage_id,
-            "task": stage.get("name", f"Stage {i+1}"),
-            "action": stage.get("action", ""),
-            "parallel": stage.get("parallel", False)
-        }
-        
-        if prev_id:
-            stage_config["depends_on"] = [prev_id]
-        
-        if with_gates and i > 0:
-            stage_config["human_gate"] = True
-        
-        template["sub_tasks"].append(stage_config)
-        prev_id = stage_id
-    
-    return template
+
+
+# Fixed shape of generate_refactor_template's output; "task" is filled from
+# the steps and "{component}" in actions is replaced by the component name
+_REFACTOR_STEPS = (
+    "Update Schema",
+    "Create Migration",
+    "Update API",
+    "Update Tests",
+    "Security Review"
+)
+_REFACTOR_SKELETON = (
+    {
+        "id": "schema_update",
+        "task": None,
+        "action": "Update schema for {component}"
+    },
+    {
+        "id": "migration",
+        "task": None,
+        "action": "Create migration for {component}",
+        "depends_on": ["schema_update"]
+    },
+    {
+        "id": "api_update",
+        "task": None,
+        "action": "Update API for {component}",
+        "depends_on": ["migration"]
+    },
+    {
+        "id": "tests",
+        "task": None,
+        "action": "Update tests for {component}",
+        "depends_on": ["api_update"]
+    },
+    {
+        "id": "security_review",
+        "task": None,
+        "human_gate": True,
+        "action": "Review security for {component}",
+        "depends_on": ["tests"]
+    }
+)
+
+
+def _fill_refactor_step(skeleton: Dict[str, Any], task: str, component_name: str) -> Dict[str, Any]:
+    """Instantiate one skeleton step with fresh mutable values."""
+    step = dict(skeleton)
+    step["task"] = task
+    step["action"] = skeleton["action"].format(component=component_name)
+    if "depends_on" in skeleton:
+        step["depends_on"] = list(skeleton["depends_on"])
+    return step
 
 
 def generate_refactor_template(
@@ -124,50 +159,18 @@ def generate_refactor_template(
         Task configuration dictionary
     """
     if steps is None:
-        steps = [
-            "Update Schema",
-            "Create Migration",
-            "Update API",
-            "Update Tests",
-            "Security Review"
-        ]
+        steps = _REFACTOR_STEPS
     
-    template = {
+    # Missing steps fall back to the default names
+    return {
         "task": f"Refactor {component_name}",
         "parallel": False,
         "sub_tasks": [
-            {
-                "id": "schema_update",
-                "task": steps[0] if len(steps) > 0 else "Update Schema",
-                "action": f"Update schema for {component_name}"
-            },
-            {
-                "id": "migration",
-                "task": steps[1] if len(steps) > 1 else "Create Migration",
-                "action": f"Create migration for {component_name}",
-                "depends_on": ["schema_update"]
-            },
-            {
-                "id": "api_update",
-                "task": steps[2] if len(steps) > 2 else "Update API",
-                "action": f"Update API for {component_name}",
-                "depends_on": ["migration"]
-            },
-            {
-                "id": "tests",
-                "task": steps[3] if len(steps) > 3 else "Update Tests",
-                "action": f"Update tests for {component_name}",
-                "depends_on": ["api_update"]
-            },
-            {
-                "id": "security_review",
-                "task": steps[4] if len(steps) > 4 else "Security Review",
-                "human_gate": True,
-                "action": f"Review security for {component_name}",
-                "depends_on": ["tests"]
-            }
+            _fill_refactor_step(
+                skeleton,
+                steps[i] if len(steps) > i else default_task,
+                component_name
+            )
+            for i, (skeleton, default_task) in enumerate(zip(_REFACTOR_SKELETON, _REFACTOR_STEPS))
         ]
     }
-    
-    return template
-
@@ -2,12 +2,24 @@
 Timeout handling for task execution.
 """
 
+import asyncio
+import heapq
+import itertools
 import threading
-from typing import Optional, Dict
-from contextlib import contextmanager
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Optional, Dict, List
 
 from colorama import Fore, Style
 
+from loom.utils import ThreadSafeDict
+
+# Bound once so hot paths skip the module attribute lookup. Deadlines use
+# the monotonic clock; check_timeout/get_remaining_time take wall-clock
+# start times (TaskNode.start_time), so they stay on time.time.
+_monotonic = time.monotonic
+_wall_time = time.time
+
 
 class TimeoutError(Exception):
     """Raised when a task times out."""
@@ -27,38 +39,89 @@ class TimeoutManager:
             default_timeout: Default timeout in seconds (None for no timeout)
         """
         self.default_timeout = default_timeout
-        self.active_timeouts: Dict[str, threading.Timer] = {}
+        # Pending deadline entry ([task_id, timeout, cancelled]) per task
+        self.active_timeouts: Dict[str, List[Any]] = ThreadSafeDict()
+        
+        # Task ids whose timeout expired
+        self.timed_out: List[str] = []
+        
+        # One monitor thread watches a min-heap of (deadline, seq, entry)
+        # instead of starting a Timer thread per task; cancelled entries are
+        # skipped when they reach the top
+        self._heap: List[Any] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._monitor: Optional[threading.Thread] = None
+        
+        # Finished contexts ready for reuse; list pop/append are atomic
+        self._free_contexts: List["_TimeoutCtx"] = []
     
-    @contextmanager
-    def timeout_context(self, timeout: Optional[float], task_id: str):
+    def timeout_context(self, timeout: Optional[float], task_id: str) -> "_TimeoutCtx":
         """
         Context manager for timeout handling.
         
         Args:
             timeout: Timeout in seconds (None to use default, 0 for no timeout)
             task_id: Task identifier for logging
+            
+        Returns:
+            Context manager guarding the task; instances are recycled
         """
         if timeout is None:
             timeout = self.default_timeout
         
-        if timeout is None or timeout <= 0:
-            # No timeout
-            yield
-            return
-        
-        def _timeout_handler():
-            raise TimeoutError(f"Task {task_id} timed out after {timeout}s")
-        
-        timer = threading.Timer(timeout, _timeout_handler)
-        timer.start()
-        self.active_timeouts[task_id] = timer
-        
         try:
-            yield
-        finally:
-            if task_id in self.active_timeouts:
-                self.active_timeouts[task_id].cancel()
-                del self.active_timeouts[task_id]
+            ctx = self._free_contexts.pop()
+        except IndexError:
+            ctx = _TimeoutCtx(self)
+        ctx.task_id = task_id
+        ctx.timeout = timeout
+        return ctx
+    
+    def _schedule(self, task_id: str, timeout: float) -> List[Any]:
+        """Register a deadline with the monitor thread, starting it if needed."""
+        entry = [task_id, timeout, False]
+        self.active_timeouts[task_id] = entry
+        with self._cond:
+            heapq.heappush(self._heap, (_monotonic() + timeout, next(self._seq), entry))
+            if self._monitor is None:
+                self._monitor = threading.Thread(
+                    target=self._monitor_loop, name="loom-timeouts", daemon=True
+                )
+                self._monitor.start()
+            elif self._heap[0][2] is entry:
+                # New earliest deadline; wake the monitor to re-arm its wait
+                self._cond.notify()
+        return entry
+    
+    def _monitor_loop(self) -> None:
+        """Wait for the earliest deadline and report tasks that ran past it."""
+        heap = self._heap
+        while True:
+            expired = []
+            with self._cond:
+                while not expired:
+                    while heap and heap[0][2][2]:
+                        heapq.heappop(heap)
+                    if not heap:
+                        self._cond.wait()
+                        continue
+                    delay = heap[0][0] - _monotonic()
+                    if delay > 0:
+                        self._cond.wait(delay)
+                        continue
+                    while heap and heap[0][0] <= _monotonic():
+                        entry = heapq.heappop(heap)[2]
+                        if not entry[2]:
+                            expired.append(entry)
+            
+            for task_id, timeout, _ in expired:
+                self._on_timeout(task_id, timeout)
+    
+    def _on_timeout(self, task_id: str, timeout: float) -> None:
+        """Record and report a task whose timeout expired."""
+        self.timed_out.append(task_id)
+        print(f"{Fore.RED}⏱️  Task {task_id} timed out after {timeout}s{Style.RESET_ALL}")
     
     def cancel_timeout(self, task_id: str) -> None:
         """
@@ -67,9 +130,9 @@ class TimeoutManager:
         Args:
             task_id: Task identifier
         """
-        if task_id in self.active_timeouts:
-            self.active_timeouts[task_id].cancel()
-            del self.active_timeouts[task_id]
+        entry = self.active_timeouts.pop(task_id, None)
+        if entry is not None:
+            entry[2] = True
     
     def check_timeout(self, start_time: float, timeout: Optional[float], task_id: str) -> bool:
         """
@@ -89,8 +152,7 @@ class TimeoutManager:
         if timeout is None or timeout <= 0:
             return False
         
-        import time
-        elapsed = time.time() - start_time
+        elapsed = _wall_time() - start_time
         return elapsed >= timeout
     
     def get_remaining_time(self, start_time: float, timeout: Optional[float]) -> Optional[float]:
@@ -110,8 +172,116 @@ class TimeoutManager:
         if timeout is None or timeout <= 0:
             return None
         
-        import time
-        elapsed = time.time() - start_time
+        elapsed = _wall_time() - start_time
         remaining = timeout - elapsed
         return max(0, remaining)
 
+
+class _TimeoutCtx:
+    """Reusable context guarding one task execution with a timeout."""
+    
+    __slots__ = ('mgr', 'task_id', 'timeout', 'entry')
+    
+    def __init__(self, mgr: TimeoutManager):
+        self.mgr = mgr
+        self.task_id: Optional[str] = None
+        self.timeout: Optional[float] = None
+        self.entry: Optional[List[Any]] = None
+    
+    def __enter__(self) -> "_TimeoutCtx":
+        timeout = self.timeout
+        if timeout is not None and timeout > 0:
+            self.entry = self.mgr._schedule(self.task_id, timeout)
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self.entry is not None:
+            # Lazy deletion: the monitor drops cancelled entries
+            self.entry[2] = True
+            self.mgr.active_timeouts.pop(self.task_id, None)
+            self.entry = None
+        self.task_id = None
+        self.mgr._free_contexts.append(self)
+
+
+class AsyncTimeoutManager:
+    """
+    Timeouts for coroutine-based task execution.
+    
+    Deadlines are enforced by the running event loop, so no monitor thread
+    is involved, and unlike TimeoutManager an expired task is actually
+    cancelled: it raises TimeoutError instead of only being reported.
+    """
+    
+    def __init__(self, default_timeout: Optional[float] = None):
+        """
+        Initialize async timeout manager.
+        
+        Args:
+            default_timeout: Default timeout in seconds (None for no timeout)
+        """
+        self.default_timeout = default_timeout
+        
+        # Task ids whose timeout expired
+        self.timed_out: List[str] = []
+    
+    @asynccontextmanager
+    async def timeout_context(self, timeout: Optional[float], task_id: str) -> AsyncIterator[None]:
+        """
+        Async context manager cancelling its body once the timeout expires.
+        
+        Requires Python 3.11+ (``asyncio.timeout``); use run() on older
+        versions.
+        
+        Args:
+            timeout: Timeout in seconds (None to use default, 0 for no timeout)
+            task_id: Task identifier for logging
+            
+        Raises:
+            TimeoutError: If the body ran past the timeout
+        """
+        if timeout is None:
+            timeout = self.default_timeout
+        
+        if timeout is None or timeout <= 0:
+            yield
+            return
+        
+        try:
+            async with asyncio.timeout(timeout):
+                yield
+        except asyncio.TimeoutError as e:
+            self._on_timeout(task_id, timeout)
+            raise TimeoutError(f"Task {task_id} timed out after {timeout}s") from e
+    
+    async def run(self, awaitable: Awaitable[Any], timeout: Optional[float], task_id: str) -> Any:
+        """
+        Await a task with a timeout.
+        
+        Args:
+            awaitable: Coroutine or other awaitable to run
+            timeout: Timeout in seconds (None to use default, 0 for no timeout)
+            task_id: Task identifier for logging
+            
+        Returns:
+            The awaitable's result
+            
+        Raises:
+            TimeoutError: If the task ran past the timeout
+        """
+        if timeout is None:
+            timeout = self.default_timeout
+        
+        if timeout is None or timeout <= 0:
+            return await awaitable
+        
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError as e:
+            self._on_timeout(task_id, timeout)
+            raise TimeoutError(f"Task {task_id} timed out after {timeout}s") from e
+    
+    def _on_timeout(self, task_id: str, timeout: float) -> None:
+        """Record and report a task whose timeout expired."""
+        self.timed_out.append(task_id)
+        print(f"{Fore.RED}⏱️  Task {task_id} timed out after {timeout}s{Style.RESET_ALL}")
@@ -2,25 +2,199 @@
 Utility functions for Loom task orchestration.
 """
 
-import json
 import hashlib
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from loom.status import STATUS_NAMES, TaskStatus
+
+# calculate_task_hash results keyed by id(config), most recent last; each
+# entry keeps the config alive so its id can't be reused
+_HASH_CACHE: "OrderedDict[int, Tuple[Dict[str, Any], str]]" = OrderedDict()
+_HASH_CACHE_SIZE = 128
+_HASH_CACHE_LOCK = threading.Lock()
+
+# format_timestamp's most recent (whole second, formatted string)
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+_LAST_TIMESTAMP: Tuple[Optional[int], str] = (None, "")
+
+
+class ThreadSafeDict(dict):
+    """
+    Dict whose mutating operations hold an internal lock.
+    
+    Plain dict operations rely on the GIL for atomicity; this keeps writes
+    and read-modify-write helpers consistent on free-threaded builds too.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+    
+    def __setitem__(self, key, value) -> None:
+        with self._lock:
+            super().__setitem__(key, value)
+    
+    def __delitem__(self, key) -> None:
+        with self._lock:
+            super().__delitem__(key)
+    
+    def get(self, key, default=None):
+        with self._lock:
+            return super().get(key, default)
+    
+    def pop(self, key, *default):
+        with self._lock:
+            return super().pop(key, *default)
+    
+    def setdefault(self, key, default=None):
+        with self._lock:
+            return super().setdefault(key, default)
+    
+    def increment(self, key, amount: int = 1) -> int:
+        """
+        Atomically add to a counter stored under a key.
+        
+        Args:
+            key: Counter key (missing keys start at 0)
+            amount: Amount to add
+            
+        Returns:
+            The new value
+        """
+        with self._lock:
+            value = super().get(key, 0) + amount
+            super().__setitem__(key, value)
+            return value
+
+
+class _Raw(bytes):
+    """Framing bytes queued on the _hash_into stack, as opposed to data."""
+
+
+_DICT_END = _Raw(b'}')
+_LIST_END = _Raw(b']')
+
+
+def _hash_into(h: Any, obj: Any) -> None:
+    """
+    Feed a canonical encoding of a JSON-like value into a hash object.
+    
+    Dict keys are visited in sorted order and every value is tagged with
+    its type (strings are also length-prefixed), so equal structures
+    always produce the same byte stream and different ones can't collide
+    by concatenation. Uses an explicit stack, so nesting depth is
+    unbounded.
+    
+    Args:
+        h: Object with an ``update(bytes)`` method, e.g. a hashlib hash
+        obj: Value to encode
+    """
+    update = h.update
+    stack = [obj]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        item = pop()
+        cls = item.__class__
+        if cls is _Raw:
+            update(item)
+        elif cls is str:
+            data = item.encode('utf-8')
+            update(b's%d:' % len(data))
+            update(data)
+        elif cls is dict:
+            update(b'{')
+            push(_DICT_END)
+            # Pushed in reverse so keys come off the stack in sorted order
+            for key in sorted(item, reverse=True):
+                push(item[key])
+                push(_Raw(b'k' + str(key).encode('utf-8') + b'\x01'))
+        elif cls is list or cls is tuple:
+            update(b'[')
+            push(_LIST_END)
+            stack.extend(reversed(item))
+        elif item is None:
+            update(b'n')
+        elif cls is bool:
+            update(b't' if item else b'f')
+        elif cls is int or cls is float:
+            update(b'i' if cls is int else b'd')
+            update(repr(item).encode('ascii'))
+            update(b'\x02')
+        else:
+            # Dates and other YAML scalars: tag with the type name
+            update(cls.__name__.encode('utf-8') + b'\x03')
+            update(repr(item).encode('utf-8'))
+            update(b'\x02')
+
+
+def _hash_json(data: Any) -> str:
+    """Return a 64-bit BLAKE2b hex digest of a JSON-like value."""
+    h = hashlib.blake2b(digest_size=8)
+    _hash_into(h, data)
+    return h.hexdigest()
 
 
 def calculate_task_hash(config: Dict[str, Any]) -> str:
     """
     Calculate a hash for a task configuration.
     
+    Hashes are memoized per config object, so treat a config as read-only
+    once it has been hashed (hash a copy of an edited config instead).
+    
     Args:
         config: Task configuration dictionary
         
     Returns:
-        SHA256 hash string
+        16-character hex digest
     """
-    config_str = json.dumps(config, sort_keys=True)
-    return hashlib.sha256(config_str.encode()).hexdigest()[:16]
+    key = id(config)
+    with _HASH_CACHE_LOCK:
+        cached = _HASH_CACHE.get(key)
+        # The entry holds the config itself, so a matching id can't belong
+        # to a different, later object
+        if cached is not None and cached[0] is config:
+            _HASH_CACHE.move_to_end(key)
+            return cached[1]
+    
+    digest = _hash_json(config)
+    
+    with _HASH_CACHE_LOCK:
+        _HASH_CACHE[key] = (config, digest)
+        if len(_HASH_CACHE) > _HASH_CACHE_SIZE:
+            _HASH_CACHE.popitem(last=False)
+    
+    return digest
+
+
+def calculate_node_hash(
+    task: str,
+    action: str,
+    depends_on: List[str],
+    sub_task_ids: List[str]
+) -> str:
+    """
+    Calculate a hash identifying a single task node's definition.
+    
+    Args:
+        task: Task description
+        action: Task action
+        depends_on: Ids of the tasks this node depends on
+        sub_task_ids: Ids of the node's direct sub-tasks
+        
+    Returns:
+        16-character hex digest
+    """
+    return _hash_json({
+        "task": task,
+        "action": action,
+        "depends_on": list(depends_on),
+        "sub_task_ids": list(sub_task_ids)
+    })
 
 
 def format_duration(seconds: float) -> str:
@@ -58,15 +232,63 @@ def format_timestamp(timestamp: Optional[float]) -> str:
     Returns:
         Formatted timestamp string
     """
+    global _LAST_TIMESTAMP
+    
     if timestamp is None:
         return "N/A"
-    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    
+    # Consecutive task events usually fall in the same second, so the last
+    # formatted second is reused; the pair is swapped in as one object
+    second = int(timestamp // 1)
+    cached_second, cached = _LAST_TIMESTAMP
+    if second == cached_second:
+        return cached
+    
+    formatted = time.strftime(_TIMESTAMP_FORMAT, time.localtime(second))
+    _LAST_TIMESTAMP = (second, formatted)
+    return formatted
+
+
+def _status_name(status: Any) -> str:
+    """Return a status's serialized name; non-TaskStatus values go through str()."""
+    if status.__class__ is TaskStatus:
+        return STATUS_NAMES[status]
+    return str(status)
+
+
+def _node_to_dict(node: Any) -> Dict[str, Any]:
+    """Build the flat dictionary view of a single task node."""
+    parent = node.parent
+    start_time = node.start_time
+    end_time = node.end_time
+    node_dict = {
+        "id": node.id,
+        "task": node.task,
+        "task_path": node.task_path,
+        "status": _status_name(node.status),
+        "action": node.action,
+        "parallel": node.parallel,
+        "human_gate": node.human_gate,
+        "depends_on": node.depends_on,
+        "parent_id": parent.id if parent else None,
+        "start_time": start_time,
+        "end_time": end_time,
+    }
+    if start_time and end_time:
+        node_dict["duration"] = end_time - start_time
+    node_dict["result"] = node.result
+    node_dict["error"] = node.error
+    return node_dict
 
 
 def flatten_task_tree(node: Any, result: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
     """
     Flatten a task tree into a list of all nodes.
     
+    Nodes are listed in pre-order, the same order a recursive walk would
+    produce, using an explicit stack so deep trees don't hit the recursion
+    limit.
+    
     Args:
         node: Task node to flatten
         result: Accumulator list (internal use)
@@ -77,60 +299,71 @@ def flatten_task_tree(node: Any, result: Optional[List[Dict[str, Any]]] = None)
     if result is None:
         result = []
     
-    node_dict = {
-        "id": node.id,
-        "task": node.task,
-        "task_path": node.task_path,
-        "status": node.status.value if hasattr(node.status, 'value') else str(node.status),
-        "action": node.action,
-        "parallel": node.parallel,
-        "human_gate": node.human_gate,
-        "depends_on": node.depends_on,
-        "parent_id": node.parent.id if node.parent else None,
-    }
-    
-    if hasattr(node, 'start_time'):
-        node_dict["start_time"] = node.start_time
-        node_dict["end_time"] = node.end_time
-        if node.start_time and node.end_time:
-            node_dict["duration"] = node.end_time - node.start_time
-    
-    if hasattr(node, 'result'):
-        node_dict["result"] = node.result
+    result.extend(map(_node_to_dict, _iter_tree(node)))
     
-    if hasattr(node, 'error'):
-        node_dict["error"] = node.error
-    
-    result.append(node_dict)
+    return result
+
+
+def build_path_index(root: Any) -> Dict[str, Any]:
+    """
+    Index a task tree by task path.
     
-    for sub_task in getattr(node, 'sub_tasks', []):
-        flatten_task_tree(sub_task, result)
+    Where several nodes share a path, the first one in pre-order wins.
     
-    return result
+    Args:
+        root: Root task node
+        
+    Returns:
+        Dictionary mapping task_path to node
+    """
+    index: Dict[str, Any] = {}
+    setdefault = index.setdefault
+    for node in _iter_tree(root):
+        setdefault(node.task_path, node)
+    return index
 
 
 def find_node_by_path(nodes: Dict[str, Any], task_path: str) -> Optional[Any]:
     """
     Find a node by its task path.
     
+    ``nodes`` may be a path index from build_path_index(), which makes this
+    a single lookup; for repeated lookups build the index once and pass it
+    in. Any other node dictionary is scanned, together with each node's
+    sub-tasks.
+    
     Args:
-        nodes: Dictionary of all nodes
+        nodes: Path index, or dictionary of nodes
         task_path: Task path to search for
         
     Returns:
         Node if found, None otherwise
     """
-    for node in nodes.values():
-        if node.task_path == task_path:
-            return node
-        # Recursively search sub-tasks
-        for sub_task in getattr(node, 'sub_tasks', []):
-            result = find_node_by_path({sub_task.id: sub_task}, task_path)
-            if result:
-                return result
+    node = nodes.get(task_path)
+    if node is not None and node.task_path == task_path:
+        return node
+    
+    seen = set()
+    for top in nodes.values():
+        stack = [top]
+        while stack:
+            current = stack.pop()
+            if id(current) in seen:
+                continue
+            seen.add(id(current))
+            if current.task_path == task_path:
+                return current
+            stack.extend(reversed(current.sub_tasks))
     return None
 
 
+def _node_deps(node: Any) -> List[str]:
+    """Return a node's dependency ids, for TaskNode objects and plain dicts."""
+    if isinstance(node, dict):
+        return node.get('depends_on', [])
+    return getattr(node, 'depends_on', [])
+
+
 def get_dependency_chain(nodes: Dict[str, Any], node_id: str) -> List[str]:
     """
     Get the full dependency chain for a node.
@@ -145,25 +378,34 @@ def get_dependency_chain(nodes: Dict[str, Any], node_id: str) -> List[str]:
     if node_id not in nodes:
         return []
     
-    node = nodes[node_id]
     chain = []
-    visited = set()
+    append = chain.append
+    in_chain = set()
+    add = in_chain.add
+    visited = {node_id}
+    
+    # Iterative post-order walk: dependencies land before their dependents.
+    # ``visited`` marks ids as they are pushed, ``in_chain`` as they are
+    # emitted; a dependency still on the stack is part of a cycle and is
+    # emitted early rather than waited for
+    stack = [(node_id, iter(_node_deps(nodes[node_id])))]
+    while stack:
+        nid, deps = stack[-1]
+        for dep in deps:
+            if dep not in visited:
+                visited.add(dep)
+                if dep in nodes:
+                    stack.append((dep, iter(_node_deps(nodes[dep]))))
+                    break
+            if dep not in in_chain:
+                add(dep)
+                append(dep)
+        else:
+            stack.pop()
+            if nid not in in_chain:
+                add(nid)
+                append(nid)
     
-    def _traverse(nid: str):
-        if nid in visited:
-            return
-        visited.add(nid)
-        
-        if nid in nodes:
-            n = nodes[nid]
-            for dep in getattr(n, 'depends_on', []):
-                _traverse(dep)
-                if dep not in chain:
-                    chain.append(dep)
-            if nid not in chain:
-                chain.append(nid)
-    
-    _traverse(node_id)
     return chain
 
 
@@ -171,33 +413,66 @@ def validate_dependency_graph(nodes: Dict[str, Any]) -> Tuple[bool, List[str]]:
     """
     Validate that the dependency graph has no cycles.
     
+    Uses Kahn's algorithm; only nodes left over when it stalls are searched
+    to report the actual cycles. Dependencies on unknown ids are ignored.
+    
     Args:
-        nodes: Dictionary of all nodes
+        nodes: Dictionary of all nodes (task nodes or dicts with 'depends_on')
         
     Returns:
         Tuple of (is_valid, list_of_errors)
     """
-    errors = []
+    indegree = dict.fromkeys(nodes, 0)
+    dependents: Dict[str, List[str]] = {}
+    for node_id, node in nodes.items():
+        for dep in _node_deps(node):
+            if dep in nodes:
+                indegree[node_id] += 1
+                dependents.setdefault(dep, []).append(node_id)
     
-    def _has_cycle(node_id: str, path: List[str]) -> bool:
-        if node_id in path:
-            cycle = path[path.index(node_id):] + [node_id]
-            errors.append(f"Circular dependency detected: {' -> '.join(cycle)}")
-            return True
-        
-        if node_id not in nodes:
-            return False
-        
-        node = nodes[node_id]
-        for dep in getattr(node, 'depends_on', []):
-            if _has_cycle(dep, path + [node_id]):
-                return True
-        return False
+    ready = deque(node_id for node_id, degree in indegree.items() if degree == 0)
+    processed = 0
+    while ready:
+        node_id = ready.popleft()
+        processed += 1
+        for dependent in dependents.get(node_id, ()):
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                ready.append(dependent)
     
-    for node_id in nodes:
-        _has_cycle(node_id, [])
+    if processed == len(nodes):
+        return True, []
+    
+    # Every remaining node is on a cycle or depends on one; a DFS over them
+    # finds each cycle through its back edge
+    remaining = {node_id for node_id, degree in indegree.items() if degree > 0}
+    errors = []
+    done = set()
+    for start in nodes:
+        if start not in remaining or start in done:
+            continue
+        path = [start]
+        on_path = {start}
+        stack = [iter(_node_deps(nodes[start]))]
+        while stack:
+            for dep in stack[-1]:
+                if dep not in remaining or dep in done:
+                    continue
+                if dep in on_path:
+                    cycle = path[path.index(dep):] + [dep]
+                    errors.append(f"Circular dependency detected: {' -> '.join(cycle)}")
+                    continue
+                path.append(dep)
+                on_path.add(dep)
+                stack.append(iter(_node_deps(nodes[dep])))
+                break
+            else:
+                stack.pop()
+                finished = path.pop()
+                on_path.discard(finished)
+                done.add(finished)
     
-    return len(errors) == 0, errors
+    return False, errors
 
 
 def aggregate_results(node: Any) -> Dict[str, Any]:
@@ -210,70 +485,132 @@ def aggregate_results(node: Any) -> Dict[str, Any]:
     Returns:
         Aggregated results dictionary
     """
-    aggregated = {
-        "node_id": node.id,
-        "task": node.task,
-        "task_path": node.task_path,
-        "status": node.status.value if hasattr(node.status, 'value') else str(node.status),
-        "result": getattr(node, 'result', None),
-        "error": getattr(node, 'error', None),
-        "children": []
-    }
+    def _entry(current: Any) -> Dict[str, Any]:
+        return {
+            "node_id": current.id,
+            "task": current.task,
+            "task_path": current.task_path,
+            "status": _status_name(current.status),
+            "result": current.result,
+            "error": current.error,
+            "children": []
+        }
     
-    for sub_task in getattr(node, 'sub_tasks', []):
-        aggregated["children"].append(aggregate_results(sub_task))
+    # Each entry is created when its parent is visited and appended to the
+    # parent's children in order, so the nesting matches the tree
+    aggregated = _entry(node)
+    stack = [(node, aggregated)]
+    while stack:
+        current, entry = stack.pop()
+        children = entry["children"]
+        for sub_task in current.sub_tasks:
+            child = _entry(sub_task)
+            children.append(child)
+            if sub_task.sub_tasks:
+                stack.append((sub_task, child))
     
     return aggregated
 
 
-def create_task_summary(nodes: Dict[str, Any]) -> Dict[str, Any]:
+def _summarize(nodes: Iterable[Any], total: int,
+               flat: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
     """
-    Create a summary of all tasks.
+    Count nodes by status and type in a single sweep.
     
     Args:
-        nodes: Dictionary of all nodes
+        nodes: Task nodes to summarize
+        total: Total number of tasks
+        flat: If given, each node's flattened dictionary is appended to it
         
     Returns:
         Summary dictionary
     """
-    summary = {
-        "total_tasks": len(nodes),
-        "by_status": {},
-        "by_type": {
-            "with_actions": 0,
-            "with_subtasks": 0,
-            "parallel": 0,
-            "with_gates": 0,
-            "with_dependencies": 0
-        },
-        "tasks": []
-    }
+    by_status: Dict[str, int] = defaultdict(int)
+    with_actions = with_subtasks = parallel = with_gates = with_dependencies = 0
+    tasks = []
+    append_task = tasks.append
     
-    for node in nodes.values():
-        # Count by status
-        status = node.status.value if hasattr(node.status, 'value') else str(node.status)
-        summary["by_status"][status] = summary["by_status"].get(status, 0) + 1
+    for node in nodes:
+        if flat is not None:
+            node_dict = _node_to_dict(node)
+            flat.append(node_dict)
+            status = node_dict["status"]
+        else:
+            status = _status_name(node.status)
+        by_status[status] += 1
         
         # Count by type
         if node.action:
-            summary["by_type"]["with_actions"] += 1
+            with_actions += 1
         if node.sub_tasks:
-            summary["by_type"]["with_subtasks"] += 1
+            with_subtasks += 1
         if node.parallel:
-            summary["by_type"]["parallel"] += 1
+            parallel += 1
         if node.human_gate:
-            summary["by_type"]["with_gates"] += 1
+            with_gates += 1
         if node.depends_on:
-            summary["by_type"]["with_dependencies"] += 1
+            with_dependencies += 1
         
         # Add task info
-        task_info = {
+        append_task({
             "id": node.id,
             "task": node.task,
             "task_path": node.task_path,
             "status": status
-        }
-        summary["tasks"].append(task_info)
+        })
+    
+    return {
+        "total_tasks": total,
+        "by_status": dict(by_status),
+        "by_type": {
+            "with_actions": with_actions,
+            "with_subtasks": with_subtasks,
+            "parallel": parallel,
+            "with_gates": with_gates,
+            "with_dependencies": with_dependencies
+        },
+        "tasks": tasks
+    }
+
+
+def _iter_tree(node: Any) -> Iterator[Any]:
+    """Yield a task tree's nodes in pre-order."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        sub_tasks = current.sub_tasks
+        if sub_tasks:
+            stack.extend(reversed(sub_tasks))
+
+
+def create_task_summary(nodes: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Create a summary of all tasks.
     
-    return summary
+    Args:
+        nodes: Dictionary of all nodes
+        
+    Returns:
+        Summary dictionary
+    """
+    return _summarize(nodes.values(), len(nodes))
 
+
+def summarize_task_tree(node: Any) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Flatten a task tree and summarize it in one traversal.
+    
+    Equivalent to calling flatten_task_tree() and create_task_summary() on
+    the same tree, without walking it twice.
+    
+    Args:
+        node: Root task node
+        
+    Returns:
+        Tuple of (flat_task_list, summary)
+    """
+    flat: List[Dict[str, Any]] = []
+    summary = _summarize(_iter_tree(node), 0, flat)
+    summary["total_tasks"] = len(flat)
+    return flat, summary
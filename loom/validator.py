@@ -2,6 +2,10 @@
 Task validation and analysis tools.
 """
 
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, List, Tuple, Optional
 from pathlib import Path
 
@@ -9,6 +13,123 @@ from loom.config import load_task_config, validate_task_config
 from loom.utils import validate_dependency_graph, get_dependency_chain
 
 
+# Per-subtree analysis counts keyed by the subtree's structural hash, most
+# recently used last. Values are (total_tasks, height, parallel_tasks,
+# human_gates, tasks_with_dependencies, tasks_with_actions).
+_ANALYSIS_CACHE: "OrderedDict[bytes, Tuple[int, int, int, int, int, int]]" = OrderedDict()
+_ANALYSIS_CACHE_SIZE = 4096
+_ANALYSIS_CACHE_LOCK = threading.Lock()
+_DONE = object()
+
+
+def _subtree_hash(cfg: Dict[str, Any], child_hashes: List[bytes]) -> bytes:
+    """
+    Hash a config node together with the hashes of its sub-tasks.
+    
+    Args:
+        cfg: Task configuration node
+        child_hashes: Hashes of the node's sub-tasks, in order
+        
+    Returns:
+        Digest identifying the subtree's definition
+    """
+    h = hashlib.blake2b(digest_size=16)
+    parts = "\0".join([
+        str(cfg.get("task", "")),
+        str(cfg.get("action", "")),
+        "1" if cfg.get("parallel", False) else "0",
+        "1" if cfg.get("human_gate", False) else "0",
+        *sorted(map(str, cfg.get("depends_on") or ())),
+    ])
+    h.update(parts.encode("utf-8"))
+    for child_hash in child_hashes:
+        h.update(child_hash)
+    return h.digest()
+
+
+def _node_stats(
+    cfg: Dict[str, Any],
+    results: List[Tuple[bytes, Tuple[int, int, int, int, int, int]]]
+) -> Tuple[bytes, Tuple[int, int, int, int, int, int]]:
+    """
+    Combine a node with its sub-tasks' (hash, counts), consulting the cache.
+    
+    Args:
+        cfg: Task configuration node
+        results: (hash, counts) of each sub-task, in order
+        
+    Returns:
+        Tuple of (subtree_hash, counts) for the node's subtree
+    """
+    key = _subtree_hash(cfg, [child_hash for child_hash, _ in results])
+    with _ANALYSIS_CACHE_LOCK:
+        stats = _ANALYSIS_CACHE.get(key)
+        if stats is not None:
+            _ANALYSIS_CACHE.move_to_end(key)
+            return key, stats
+    
+    total, height = 1, 0
+    parallel = 1 if cfg.get("parallel", False) else 0
+    gates = 1 if cfg.get("human_gate", False) else 0
+    with_deps = 1 if cfg.get("depends_on") else 0
+    with_actions = 1 if cfg.get("action") else 0
+    for _, child in results:
+        total += child[0]
+        height = max(height, child[1] + 1)
+        parallel += child[2]
+        gates += child[3]
+        with_deps += child[4]
+        with_actions += child[5]
+    stats = (total, height, parallel, gates, with_deps, with_actions)
+    
+    with _ANALYSIS_CACHE_LOCK:
+        _ANALYSIS_CACHE[key] = stats
+        if len(_ANALYSIS_CACHE) > _ANALYSIS_CACHE_SIZE:
+            _ANALYSIS_CACHE.popitem(last=False)
+    return key, stats
+
+
+def _subtree_stats(config: Dict[str, Any]) -> Tuple[bytes, Tuple[int, int, int, int, int, int]]:
+    """
+    Return the hash and analysis counts of a config tree, reusing cached subtrees.
+    
+    Args:
+        config: Task configuration dictionary
+        
+    Returns:
+        Tuple of (subtree_hash, (total_tasks, height, parallel_tasks,
+        human_gates, tasks_with_dependencies, tasks_with_actions))
+    """
+    # Iterative post-order: each frame collects its children's (hash, stats)
+    stack = [(config, iter(config.get("sub_tasks", [])), [])]
+    while True:
+        cfg, children, results = stack[-1]
+        sub_task = next(children, _DONE)
+        if sub_task is not _DONE:
+            stack.append((sub_task, iter(sub_task.get("sub_tasks", [])), []))
+            continue
+        
+        stack.pop()
+        entry = _node_stats(cfg, results)
+        if not stack:
+            return entry
+        stack[-1][2].append(entry)
+
+
+def _tree_stats(config: Dict[str, Any]) -> Tuple[int, int, int, int, int, int]:
+    """
+    Return the analysis counts for a whole config tree.
+    
+    Args:
+        config: Task configuration dictionary
+        
+    Returns:
+        Tuple of (total_tasks, height, parallel_tasks, human_gates,
+        tasks_with_dependencies, tasks_with_actions)
+    """
+    return _subtree_stats(config)[1]
+
+
 class TaskValidator:
     """
     Validates task configurations and provides analysis.
@@ -28,13 +149,25 @@ class TaskValidator:
         Returns:
             Tuple of (is_valid, list_of_errors)
         """
-        errors = []
-        
         try:
             config = load_task_config(config_path)
         except Exception as e:
             return False, [str(e)]
         
+        return self.validate_config(config)
+    
+    def validate_config(self, config: Dict[str, Any]) -> Tuple[bool, List[str]]:
+        """
+        Validate an already-loaded task configuration.
+        
+        Args:
+            config: Task configuration dictionary
+            
+        Returns:
+            Tuple of (is_valid, list_of_errors)
+        """
+        errors = []
+        
         # Additional validations
         errors.extend(self._validate_structure(config))
         errors.extend(self._validate_dependencies(config))
@@ -45,19 +178,34 @@ class TaskValidator:
         """Validate configuration structure."""
         errors = []
         
-        if "task" not in config:
-            errors.append("Missing required field: 'task'")
-        
-        if "sub_tasks" in config:
-            if not isinstance(config["sub_tasks"], list):
-                errors.append("'sub_tasks' must be a list")
-            else:
-                for i, sub_task in enumerate(config["sub_tasks"]):
-                    if not isinstance(sub_task, dict):
-                        errors.append(f"Sub-task {i} must be a dictionary")
-                    else:
-                        sub_errors = self._validate_structure(sub_task)
-                        errors.extend([f"Sub-task {i}: {e}" for e in sub_errors])
+        # Pre-order walk; stack entries are (config, error prefix) pairs or
+        # already-formatted errors, pushed in reverse so they come back out
+        # in declaration order
+        stack: List[Any] = [(config, "")]
+        while stack:
+            item = stack.pop()
+            if item.__class__ is str:
+                errors.append(item)
+                continue
+            
+            cfg, prefix = item
+            if "task" not in cfg:
+                errors.append(f"{prefix}Missing required field: 'task'")
+            
+            # Leaves are the common case
+            if "sub_tasks" not in cfg:
+                continue
+            sub_tasks = cfg["sub_tasks"]
+            if not isinstance(sub_tasks, list):
+                errors.append(f"{prefix}'sub_tasks' must be a list")
+                continue
+            
+            for i in range(len(sub_tasks) - 1, -1, -1):
+                sub_task = sub_tasks[i]
+                if isinstance(sub_task, dict):
+                    stack.append((sub_task, f"{prefix}Sub-task {i}: "))
+                else:
+                    stack.append(f"{prefix}Sub-task {i} must be a dictionary")
         
         return errors
     
@@ -68,28 +216,25 @@ class TaskValidator:
         # Build a map of all task IDs
         task_ids = set()
         
-        def _collect_ids(cfg: Dict[str, Any], prefix: str = ""):
-            task_id = cfg.get("id", f"{prefix}root")
+        stack = [(config, "")]
+        while stack:
+            cfg, prefix = stack.pop()
+            task_id = cfg["id"] if "id" in cfg else sys.intern(f"{prefix}root")
             if task_id in task_ids:
                 errors.append(f"Duplicate task ID: {task_id}")
             task_ids.add(task_id)
             
-            for i, sub_task in enumerate(cfg.get("sub_tasks", [])):
-                sub_id = sub_task.get("id", f"{task_id}_subtask_{i}")
-                _collect_ids(sub_task, f"{task_id}_")
-        
-        _collect_ids(config)
+            stack.extend((sub_task, f"{task_id}_") for sub_task in reversed(cfg.get("sub_tasks", [])))
         
         # Validate depends_on references
-        def _validate_deps(cfg: Dict[str, Any]):
+        stack = [config]
+        while stack:
+            cfg = stack.pop()
             for dep_id in cfg.get("depends_on", []):
                 if dep_id not in task_ids:
                     errors.append(f"Dependency '{dep_id}' references non-existent task")
             
-            for sub_task in cfg.get("sub_tasks", []):
-                _validate_deps(sub_task)
-        
-        _validate_deps(config)
+            stack.extend(reversed(cfg.get("sub_tasks", [])))
         
         return errors
     
@@ -108,36 +253,31 @@ class TaskValidator:
         except Exception as e:
             return {"error": str(e)}
         
-        analysis = {
-            "total_tasks": 0,
-            "max_depth": 0,
-            "parallel_tasks": 0,
-            "human_gates": 0,
-            "tasks_with_dependencies": 0,
-            "tasks_with_actions": 0,
-            "dependency_chains": []
-        }
+        return self.analyze_config_dict(config)
+    
+    def analyze_config_dict(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Analyze an already-loaded task configuration.
         
-        def _analyze(cfg: Dict[str, Any], depth: int = 0):
-            analysis["total_tasks"] += 1
-            analysis["max_depth"] = max(analysis["max_depth"], depth)
-            
-            if cfg.get("parallel", False):
-                analysis["parallel_tasks"] += 1
-            
-            if cfg.get("human_gate", False):
-                analysis["human_gates"] += 1
-            
-            if cfg.get("depends_on"):
-                analysis["tasks_with_dependencies"] += 1
-            
-            if cfg.get("action"):
-                analysis["tasks_with_actions"] += 1
+        Args:
+            config: Task configuration dictionary
             
-            for sub_task in cfg.get("sub_tasks", []):
-                _analyze(sub_task, depth + 1)
+        Returns:
+            Analysis dictionary
+        """
+        # Unchanged subtrees (including the whole tree on repeat calls) are
+        # summed from the cache instead of being re-counted
+        total, height, parallel, gates, with_deps, with_actions = _tree_stats(config)
         
-        _analyze(config)
+        analysis = {
+            "total_tasks": total,
+            "max_depth": height,
+            "parallel_tasks": parallel,
+            "human_gates": gates,
+            "tasks_with_dependencies": with_deps,
+            "tasks_with_actions": with_actions,
+            "dependency_chains": []
+        }
         
         return analysis
     
@@ -156,11 +296,25 @@ class TaskValidator:
         except Exception as e:
             return False, [str(e)]
         
+        return self.check_dependency_cycles_dict(config)
+    
+    def check_dependency_cycles_dict(self, config: Dict[str, Any]) -> Tuple[bool, List[str]]:
+        """
+        Check an already-loaded configuration for circular dependencies.
+        
+        Args:
+            config: Task configuration dictionary
+            
+        Returns:
+            Tuple of (is_valid, list_of_cycles)
+        """
         # Build node map for validation
         nodes = {}
         
         def _build_nodes(cfg: Dict[str, Any], parent_id: Optional[str] = None):
-            task_id = cfg.get("id", "root" if parent_id is None else f"task_{len(nodes)}")
+            task_id = cfg["id"] if "id" in cfg else (
+                "root" if parent_id is None else sys.intern(f"task_{len(nodes)}")
+            )
             nodes[task_id] = {
                 "id": task_id,
                 "depends_on": cfg.get("depends_on", [])
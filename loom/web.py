@@ -2,12 +2,20 @@
 Web server and Kanban GUI for Loom task visualization.
 """
 
+import gzip
+import hashlib
 import json
+import os
+import queue
+import secrets
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional
-from flask import Flask, render_template_string, jsonify, request
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 
 try:
     from flask_cors import CORS
@@ -15,10 +23,95 @@ try:
 except ImportError:
     HAS_CORS = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+try:
+    from gevent.pywsgi import WSGIServer
+    HAS_GEVENT = True
+except ImportError:
+    HAS_GEVENT = False
+
 from loom.engine import TaskEngine, TaskNode, TaskStatus
 from loom.config import load_task_config
 from loom.state import StateManager
-from loom.utils import flatten_task_tree, create_task_summary
+from loom.utils import flatten_task_tree, summarize_task_tree
+
+
+# Directory searched for task files named without a path
+_TASKS_DIR = Path("tasks")
+
+# Most loaded task files whose /api/load payload is kept for reuse
+_LOAD_CACHE_SIZE = 32
+
+# Seconds browsers may reuse the Kanban page without revalidating
+_INDEX_MAX_AGE = 3600
+
+# Seconds of silence after which /api/stream sends an SSE comment so
+# proxies and browsers keep the connection open
+_STREAM_KEEPALIVE = 15.0
+
+# Seconds task changes are collected before being sent as one stream frame
+_STREAM_BATCH_INTERVAL = 0.05
+
+# Responses smaller than this many bytes are sent uncompressed
+_COMPRESS_MIN_SIZE = 512
+
+# gzip/brotli level: most of the size reduction for a fraction of the CPU
+_COMPRESS_LEVEL = 4
+
+# Body types worth compressing; event streams are left alone so events
+# aren't held back in a compressor's buffer
+_COMPRESS_MIMETYPES = frozenset(('text/html', 'application/json'))
+
+# Most compressed bodies kept for reuse (the page and recent status bodies)
+_COMPRESS_CACHE_SIZE = 8
+
+
+def _minify_page(html: str) -> str:
+    """
+    Strip indentation and blank lines from the board page.
+    
+    The page's markup, CSS and JS are all insensitive to leading
+    whitespace, so this is safe without parsing any of them.
+    
+    Args:
+        html: Rendered page
+        
+    Returns:
+        The page with every line trimmed and empty lines dropped
+    """
+    return "\n".join(line.strip() for line in html.splitlines() if line.strip())
+
+
+class _OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider serializing with orjson.
+    
+    Honors the same sort_keys, default and indent settings as Flask's
+    default provider. Differences: non-ASCII text is sent as UTF-8 rather
+    than escaped, and dates are encoded natively as ISO 8601.
+    """
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option).decode()
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
 
 
 class LoomWebServer:
@@ -37,62 +130,392 @@ class LoomWebServer:
         self.host = host
         self.port = port
         self.app = Flask(__name__)
+        if HAS_ORJSON:
+            # Every jsonify() call, notably the polled /api/status, goes
+            # through the C serializer
+            self.app.json = _OrjsonProvider(self.app)
         if HAS_CORS:
             CORS(self.app)
+        self.app.after_request(self._compress)
         
         self.engine: Optional[TaskEngine] = None
         self.current_config: Optional[Dict[str, Any]] = None
         self.execution_thread: Optional[threading.Thread] = None
         self.start_time: Optional[float] = None
         
+        # Set by /api/stop; the running engine starts no further tasks
+        self._cancel_event = threading.Event()
+        
+        # Task files are parsed off the request thread; /api/load hands out
+        # a job id whose result is collected from /api/load/<job_id>
+        self._loader_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="loom-load")
+        self._load_jobs: Dict[str, Future] = {}
+        self._load_jobs_lock = threading.Lock()
+        
+        # /api/load payloads by (path, mtime_ns, size), most recent last, so
+        # reloading an unchanged file skips parsing and building its tree
+        self._load_cache: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+        self._load_cache_lock = threading.Lock()
+        
+        # Task files in _TASKS_DIR by name, with the directory mtime_ns the
+        # listing was taken at
+        self._task_index: Tuple[Optional[int], Dict[str, Path]] = (None, {})
+        
+        # Shared across requests so parsed state files stay cached
+        self.state_manager = StateManager()
+        
+        # One queue per connected /api/stream client; events are encoded
+        # once and fanned out to all of them
+        self._subscribers: List["queue.Queue[str]"] = []
+        self._subscribers_lock = threading.Lock()
+        
+        # Task changes waiting for the next stream frame, latest per task id,
+        # and whether a flush is already scheduled
+        self._pending_tasks: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_scheduled = False
+        
+        # Last full /api/status body and the state it was built from. Hits
+        # read the tuple without locking; the lock lets one request rebuild
+        # it while concurrent pollers of the same state wait for the result
+        self._status_cache: Tuple[Any, bytes] = (None, b"")
+        self._status_lock = threading.Lock()
+        
+        # Compressed bodies by (encoding, body); the page and unchanged status
+        # snapshots are served many times over
+        self._compressed: Dict[Tuple[str, bytes], bytes] = {}
+        
         self._setup_routes()
     
+    def _status_payload(
+        self,
+        engine: TaskEngine,
+        running: bool,
+        version: int,
+        completed: int,
+        body: Dict[str, Any],
+        active_workers: int
+    ) -> Dict[str, Any]:
+        """
+        Assemble an /api/status response.
+        
+        Args:
+            engine: Engine being reported on
+            running: Whether execution is still in progress
+            version: Engine state version the response corresponds to
+            completed: Number of completed tasks
+            body: Task fields ("tasks"/"summary" or "deltas")
+            active_workers: Number of running tasks
+            
+        Returns:
+            Response dictionary
+        """
+        total = engine.total_count
+        return {
+            "running": running,
+            "version": version,
+            **body,
+            "progress": {
+                "completed": completed,
+                "total": total,
+                "percentage": (completed / total * 100) if total > 0 else 0
+            },
+            "workers": active_workers,
+            # Calculate tool calls (approximate as completed tasks)
+            "tool_calls": completed,
+            "start_time": self.start_time
+        }
+    
+    def _compress(self, response: Response) -> Response:
+        """
+        Compress a response body when the client accepts it.
+        
+        Brotli is preferred when the ``brotli`` package is installed, gzip
+        otherwise. Streamed, small and already-encoded responses pass through.
+        
+        Args:
+            response: Response produced by a view
+            
+        Returns:
+            The response, with its body compressed if worthwhile
+        """
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or response.mimetype not in _COMPRESS_MIMETYPES
+            or 'Content-Encoding' in response.headers
+        ):
+            return response
+        
+        accepted = request.accept_encodings
+        if HAS_BROTLI and 'br' in accepted:
+            encoding = 'br'
+        elif 'gzip' in accepted:
+            encoding = 'gzip'
+        else:
+            return response
+        
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        if len(data) < _COMPRESS_MIN_SIZE:
+            return response
+        
+        key = (encoding, data)
+        compressed = self._compressed.get(key)
+        if compressed is None:
+            if encoding == 'br':
+                compressed = brotli.compress(data, quality=_COMPRESS_LEVEL)
+            else:
+                compressed = gzip.compress(data, compresslevel=_COMPRESS_LEVEL, mtime=0)
+            if len(self._compressed) >= _COMPRESS_CACHE_SIZE:
+                self._compressed.clear()
+            self._compressed[key] = compressed
+        
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        # The encoded body is a different representation of the same resource
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+    
+    def _indexed_task_file(self, name: str) -> Optional[Path]:
+        """
+        Look up a task file in the tasks directory by name.
+        
+        The directory is only listed again after its mtime changes, so a
+        lookup normally costs a single stat.
+        
+        Args:
+            name: File name, without any directory part
+            
+        Returns:
+            Path to the file, or None if the directory has no such file
+        """
+        try:
+            mtime = os.stat(_TASKS_DIR).st_mtime_ns
+        except OSError:
+            return None
+        
+        listed_mtime, index = self._task_index
+        if listed_mtime != mtime:
+            with os.scandir(_TASKS_DIR) as entries:
+                index = {
+                    entry.name: Path(entry.path) for entry in entries
+                    if entry.name.endswith((".yaml", ".yml")) and entry.is_file()
+                }
+            self._task_index = (mtime, index)
+        
+        return index.get(name)
+    
+    def _load_file(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Parse a task file and build its tree for display.
+        
+        Args:
+            file_path: Resolved path to the task file
+            
+        Returns:
+            The /api/load response payload, shared with later loads of the
+            unchanged file
+        """
+        stat = os.stat(file_path)
+        cache_key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+        with self._load_cache_lock:
+            payload = self._load_cache.get(cache_key)
+            if payload is not None:
+                self._load_cache.move_to_end(cache_key)
+        
+        if payload is None:
+            config = load_task_config(file_path)
+            
+            # Build tree without executing
+            engine = TaskEngine(verbose=False)
+            engine.root_node = engine._build_task_tree(config, parent=None)
+            
+            tasks = flatten_task_tree(engine.root_node)
+            
+            payload = {
+                "success": True,
+                "config": config,
+                "tasks": tasks,
+                "total_tasks": engine.total_count,
+                "file_path": str(file_path)
+            }
+            with self._load_cache_lock:
+                self._load_cache[cache_key] = payload
+                if len(self._load_cache) > _LOAD_CACHE_SIZE:
+                    self._load_cache.popitem(last=False)
+        
+        self.current_config = payload["config"]
+        return payload
+    
+    def _publish(self, event: Dict[str, Any]) -> None:
+        """Send an event to every connected stream client."""
+        data = self.app.json.dumps(event)
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.put_nowait(data)
+    
+    def _on_status_change(self, node: TaskNode, version: int) -> None:
+        """Queue a task's new status for stream clients (engine status listener)."""
+        with self._pending_lock:
+            # Listeners on different workers can run out of version order;
+            # keep whichever change is newest
+            pending = self._pending_tasks.get(node.id)
+            if pending is None or pending["version"] < version:
+                self._pending_tasks[node.id] = {
+                    "id": node.id,
+                    "version": version,
+                    "status": str(node.status),
+                    "start_time": node.start_time,
+                    "end_time": node.end_time,
+                    "error": node.error
+                }
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        
+        timer = threading.Timer(_STREAM_BATCH_INTERVAL, self._flush_pending)
+        timer.daemon = True
+        timer.start()
+    
+    def _flush_pending(self) -> None:
+        """Send the queued task changes to stream clients as one event."""
+        with self._pending_lock:
+            self._flush_scheduled = False
+            if not self._pending_tasks:
+                return
+            tasks = list(self._pending_tasks.values())
+            self._pending_tasks = {}
+            # Published under the lock so frames leave in the order taken
+            self._publish({"type": "tasks", "tasks": tasks})
+    
+    def _stream_events(self) -> Iterator[str]:
+        """Yield server-sent events for one client until it disconnects."""
+        events: "queue.Queue[str]" = queue.Queue()
+        with self._subscribers_lock:
+            self._subscribers.append(events)
+        try:
+            while True:
+                try:
+                    data = events.get(timeout=_STREAM_KEEPALIVE)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {data}\n\n"
+        finally:
+            with self._subscribers_lock:
+                self._subscribers.remove(events)
+    
     def _setup_routes(self):
         """Setup Flask routes."""
         
+        # The board is static, so it is compiled, rendered, minified and
+        # compressed at the highest levels once; browsers revalidate against
+        # the ETag and get a 304 while it is unchanged
+        self._index_template = self.app.jinja_env.from_string(KANBAN_HTML)
+        index_body = _minify_page(self._index_template.render()).encode('utf-8')
+        index_etag = hashlib.blake2b(index_body, digest_size=16).hexdigest()
+        index_encoded = {}
+        if HAS_BROTLI:
+            index_encoded['br'] = brotli.compress(index_body, quality=11)
+        index_encoded['gzip'] = gzip.compress(index_body, compresslevel=9, mtime=0)
+        
         @self.app.route('/')
         def index():
             """Serve the Kanban board HTML."""
-            return render_template_string(KANBAN_HTML)
+            accepted = request.accept_encodings
+            encoding = next((name for name in index_encoded if name in accepted), None)
+            if encoding is None:
+                response = Response(index_body, mimetype='text/html')
+                response.set_etag(index_etag)
+            else:
+                response = Response(index_encoded[encoding], mimetype='text/html')
+                response.headers['Content-Encoding'] = encoding
+                response.set_etag(index_etag, weak=True)
+            response.vary.add('Accept-Encoding')
+            response.cache_control.public = True
+            response.cache_control.max_age = _INDEX_MAX_AGE
+            return response.make_conditional(request)
         
         @self.app.route('/api/status')
         def get_status():
-            """Get current execution status."""
-            if not self.engine or not self.engine.root_node:
-                return jsonify({
-                    "running": False,
+            """
+            Get current execution status.
+            
+            With ``?since=<version>`` (a ``version`` from an earlier
+            response) only the task changes made since then are returned,
+            under ``deltas``; the full task list is sent when the version
+            can't be served from the engine's change history.
+            """
+            engine = self.engine
+            running = self.execution_thread is not None and self.execution_thread.is_alive()
+            if not engine or not engine.root_node:
+                # Also the case while a new run is still building its tree
+                payload = {
+                    "running": running,
                     "tasks": [],
                     "summary": {},
                     "workers": 0,
                     "tool_calls": 0
-                })
+                }
+                if engine:
+                    payload["version"] = engine.state_version
+                return jsonify(payload)
             
-            tasks = flatten_task_tree(self.engine.root_node)
-            summary = create_task_summary(self.engine.all_nodes)
+            # Read the version first: a snapshot taken afterwards may already
+            # include later changes, which clients simply re-apply
+            version = engine.state_version
+            completed = engine.completed_count
             
-            # Count active workers (running tasks)
-            active_workers = sum(1 for task in tasks if task.get('status') == 'running')
+            since = request.args.get('since', type=int)
+            deltas = engine.deltas_since(since) if since is not None else None
+            if deltas is not None:
+                return jsonify(self._status_payload(
+                    engine, running, version, completed,
+                    {"deltas": deltas},
+                    engine.running_count
+                ))
             
-            # Calculate tool calls (approximate as completed tasks)
-            tool_calls = self.engine.completed_count
+            # Full snapshots only change with the state version (plus the few
+            # fields tracked outside it), so idle polls reuse the last body
+            key = (engine, version, running, completed, self.start_time)
+            cached_key, body = self._status_cache
+            if cached_key != key:
+                with self._status_lock:
+                    cached_key, body = self._status_cache
+                    if cached_key != key:
+                        tasks, summary = summarize_task_tree(engine.root_node)
+                        payload = self._status_payload(
+                            engine, running, version, completed,
+                            {"tasks": tasks, "summary": summary},
+                            engine.running_count
+                        )
+                        body = f"{self.app.json.dumps(payload)}\n".encode('utf-8')
+                        self._status_cache = (key, body)
             
-            return jsonify({
-                "running": self.execution_thread is not None and self.execution_thread.is_alive(),
-                "tasks": tasks,
-                "summary": summary,
-                "progress": {
-                    "completed": self.engine.completed_count,
-                    "total": self.engine.total_count,
-                    "percentage": (self.engine.completed_count / self.engine.total_count * 100) if self.engine.total_count > 0 else 0
-                },
-                "workers": active_workers,
-                "tool_calls": tool_calls,
-                "start_time": self.start_time
-            })
+            return Response(body, mimetype=self.app.json.mimetype)
+        
+        @self.app.route('/api/stream')
+        def stream():
+            """Stream task status changes as server-sent events."""
+            return Response(
+                self._stream_events(),
+                mimetype='text/event-stream',
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
         
         @self.app.route('/api/load', methods=['POST'])
         def load_task():
-            """Load a task configuration file."""
+            """
+            Start loading a task configuration file.
+            
+            Responds 202 with a ``job_id``; the loaded tasks are fetched
+            from ``/api/load/<job_id>``.
+            """
             data = request.json or {}
             task_file = data.get('file')
             
@@ -103,8 +526,13 @@ class LoomWebServer:
                 # Try to resolve the file path
                 file_path = Path(task_file)
                 
+                # Bare file names are looked up in the tasks directory first
+                indexed = self._indexed_task_file(task_file) if file_path.name == task_file else None
+                if indexed is not None:
+                    file_path = indexed
+                
                 # If relative path, try common locations
-                if not file_path.is_absolute():
+                elif not file_path.is_absolute():
                     # Try current directory
                     if not file_path.exists():
                         # Try tasks directory
@@ -115,28 +543,37 @@ class LoomWebServer:
                             # Try just the filename in tasks
                             file_path = Path("tasks") / file_path
                 
-                if not file_path.exists():
+                if indexed is None and not file_path.exists():
                     return jsonify({"error": f"File not found: {task_file}"}), 404
-                
-                config = load_task_config(file_path)
-                self.current_config = config
-                
-                # Build tree without executing
-                engine = TaskEngine(verbose=False)
-                engine.root_node = engine._build_task_tree(config, parent=None)
-                engine.total_count = engine._count_tasks(engine.root_node)
-                
-                tasks = flatten_task_tree(engine.root_node)
-                
-                return jsonify({
-                    "success": True,
-                    "config": config,
-                    "tasks": tasks,
-                    "total_tasks": engine.total_count,
-                    "file_path": str(file_path)
-                })
             except Exception as e:
                 return jsonify({"error": str(e)}), 400
+            
+            job_id = secrets.token_hex(4)
+            with self._load_jobs_lock:
+                self._load_jobs[job_id] = self._loader_pool.submit(self._load_file, file_path)
+            
+            return jsonify({"success": True, "job_id": job_id}), 202
+        
+        @self.app.route('/api/load/<job_id>')
+        def load_result(job_id: str):
+            """
+            Get the result of a load job.
+            
+            Responds 202 while the file is still being loaded; the finished
+            result is handed out once.
+            """
+            with self._load_jobs_lock:
+                future = self._load_jobs.get(job_id)
+                if future is None:
+                    return jsonify({"error": "Load job not found"}), 404
+                if not future.done():
+                    return jsonify({"success": True, "pending": True}), 202
+                del self._load_jobs[job_id]
+            
+            error = future.exception()
+            if error is not None:
+                return jsonify({"error": str(error)}), 400
+            return jsonify(future.result())
         
         @self.app.route('/api/run', methods=['POST'])
         def run_task():
@@ -147,10 +584,25 @@ class LoomWebServer:
             if not self.current_config:
                 return jsonify({"error": "No task loaded"}), 400
             
+            self._cancel_event.clear()
+            
+            # Swap in the new engine before responding: the client resets its
+            # versions and fetches a snapshot as soon as this returns, and a
+            # snapshot of the previous run would make it drop the new deltas
+            engine = TaskEngine(verbose=True)
+            engine.status_listeners.append(self._on_status_change)
+            if HAS_GEVENT and _gevent_patched():
+                engine.prompt = _cooperative_input
+            self.engine = engine
+            self.start_time = time.time()
+            
             def _execute():
-                self.engine = TaskEngine(verbose=True)
-                self.start_time = time.time()
-                self.engine.execute(self.current_config)
+                try:
+                    engine.execute(self.current_config, cancel_event=self._cancel_event)
+                finally:
+                    engine.close()
+                    self._flush_pending()
+                    self._publish({"type": "done"})
             
             self.execution_thread = threading.Thread(target=_execute, daemon=True)
             self.execution_thread.start()
@@ -160,22 +612,20 @@ class LoomWebServer:
         @self.app.route('/api/stop', methods=['POST'])
         def stop_task():
             """Stop task execution."""
-            # Note: This is a simple implementation. In production, you'd want
-            # proper thread cancellation
+            # Tasks already running finish; nothing new is started
+            self._cancel_event.set()
             return jsonify({"success": True, "message": "Stop requested"})
         
         @self.app.route('/api/states')
         def list_states():
             """List saved execution states."""
-            state_manager = StateManager()
-            states = state_manager.list_states()
+            states = self.state_manager.list_states()
             return jsonify({"states": states})
         
         @self.app.route('/api/state/<execution_id>')
         def get_state(execution_id: str):
             """Get a specific execution state."""
-            state_manager = StateManager()
-            state = state_manager.load_state(execution_id)
+            state = self.state_manager.load_state(execution_id)
             
             if not state:
                 return jsonify({"error": "State not found"}), 404
@@ -191,7 +641,33 @@ class LoomWebServer:
         """
         print(f"\n🌐 Loom Kanban GUI starting on http://{self.host}:{self.port}")
         print(f"📊 Open your browser to view the task board\n")
-        self.app.run(host=self.host, port=self.port, debug=debug, use_reloader=False)
+        
+        # gevent serves each request (and each open event stream) on its own
+        # greenlet; it needs the stdlib patched before anything else is
+        # imported, which ``loom gui`` does. Debug mode keeps Werkzeug for
+        # its interactive debugger.
+        if HAS_GEVENT and not debug and _gevent_patched():
+            WSGIServer((self.host, self.port), self.app).serve_forever()
+        else:
+            self.app.run(host=self.host, port=self.port, debug=debug, use_reloader=False, threaded=True)
+
+
+def _gevent_patched() -> bool:
+    """Return True if gevent has monkey-patched threading."""
+    from gevent import monkey
+    return monkey.is_module_patched("threading")
+
+
+def _cooperative_input(prompt: str) -> str:
+    """
+    Read a human gate answer without blocking the gevent hub.
+    
+    Under monkey-patching the engine's threads are greenlets, and a plain
+    ``input()`` would stall every request and event stream until it
+    returns, so it is run on gevent's pool of real threads instead.
+    """
+    from gevent import get_hub
+    return get_hub().threadpool.apply(input, (prompt,))
 
 
 # Professional Dark-Themed Kanban Board HTML Template
@@ -410,6 +886,12 @@ KANBAN_HTML = """
             min-height: 500px;
             display: flex;
             flex-direction: column;
+            /* Card updates re-lay out and repaint only their own column, and
+               columns wrapped off-screen on narrow viewports skip rendering
+               entirely until scrolled near */
+            contain: layout paint style;
+            content-visibility: auto;
+            contain-intrinsic-size: auto 500px;
         }
         
         .column-header {
@@ -462,8 +944,11 @@ KANBAN_HTML = """
             padding: 14px;
             margin-bottom: 10px;
             cursor: pointer;
-            transition: all 0.2s;
+            transition: transform 0.2s, background-color 0.2s, border-color 0.2s, box-shadow 0.2s;
             position: relative;
+            /* Cards scrolled out of their column skip style, layout and paint */
+            content-visibility: auto;
+            contain-intrinsic-size: auto 120px;
         }
         
         .task-card:hover {
@@ -479,6 +964,19 @@ KANBAN_HTML = """
         
         .task-card.running {
             border-left: 3px solid var(--accent-blue);
+        }
+        
+        /* The pulse ring is a pre-painted layer whose opacity is animated,
+           so running cards pulse on the compositor without repainting */
+        .task-card.running::after {
+            content: "";
+            position: absolute;
+            inset: 0;
+            border-radius: inherit;
+            box-shadow: inset 0 0 0 2px rgba(59, 130, 246, 0.4);
+            pointer-events: none;
+            opacity: 0;
+            will-change: opacity;
             animation: card-pulse 2s infinite;
         }
         
@@ -499,11 +997,11 @@ KANBAN_HTML = """
         }
         
         @keyframes card-pulse {
-            0%, 100% { 
-                box-shadow: 0 0 0 0 rgba(59, 130, 246, 0.4);
+            0%, 50%, 100% {
+                opacity: 0;
             }
-            50% { 
-                box-shadow: 0 0 0 4px rgba(59, 130, 246, 0);
+            25%, 75% {
+                opacity: 1;
             }
         }
         
@@ -724,9 +1222,36 @@ KANBAN_HTML = """
         </div>
     </div>
     
+    <template id="columnTemplate">
+        <div class="kanban-column">
+            <div class="column-header">
+                <span class="column-title"></span>
+                <span class="column-count">0</span>
+            </div>
+            <div class="column-sections">
+                <div class="empty-state"><div class="empty-state-text">No tasks</div></div>
+            </div>
+        </div>
+    </template>
+    
+    <template id="taskCardTemplate">
+        <div class="task-card">
+            <div class="task-tag"></div>
+            <div class="task-title"></div>
+            <div class="task-mission"></div>
+            <div class="task-path"></div>
+        </div>
+    </template>
+    
     <script>
-        let pollInterval = null;
+        let eventSource = null;
+        let renderPending = false;
+        // Pending render work: the whole task list, or just the changed ids
+        let renderAll = false;
+        const changedIds = new Set();
         let currentTasks = [];
+        let tasksById = new Map();
+        let stateVersion = null;
         let isRunning = false;
         
         const filePathInput = document.getElementById('filePathInput');
@@ -736,6 +1261,8 @@ KANBAN_HTML = """
         const stopBtn = document.getElementById('stopBtn');
         const newIdeaBtn = document.getElementById('newIdeaBtn');
         const kanbanBoard = document.getElementById('kanbanBoard');
+        const columnTemplate = document.getElementById('columnTemplate').content.firstElementChild;
+        const taskCardTemplate = document.getElementById('taskCardTemplate').content.firstElementChild;
         const globalProgress = document.getElementById('globalProgress');
         const reviewBanner = document.getElementById('reviewBanner');
         
@@ -778,14 +1305,29 @@ KANBAN_HTML = """
                     body: JSON.stringify({ file: filePath })
                 });
                 
-                const data = await response.json();
+                let data = await response.json();
+                
+                // The file is parsed in the background; poll for the result
+                if (data.job_id) {
+                    const jobId = data.job_id;
+                    loadBtn.disabled = true;
+                    loadBtn.textContent = '⏳ Loading...';
+                    try {
+                        do {
+                            await new Promise(resolve => setTimeout(resolve, 100));
+                            data = await (await fetch(`/api/load/${jobId}`)).json();
+                        } while (data.pending);
+                    } finally {
+                        loadBtn.disabled = false;
+                        loadBtn.textContent = '📁 Load';
+                    }
+                }
                 
                 if (data.success) {
-                    currentTasks = data.tasks;
-                    renderBoard(data.tasks);
+                    setTasks(data.tasks);
+                    scheduleRender();
                     runBtn.disabled = false;
                     filePathInput.value = data.file_path || filePath;
-                    updateStats(data.tasks);
                 } else {
                     alert('Error: ' + data.error);
                 }
@@ -795,7 +1337,7 @@ KANBAN_HTML = """
         });
         
         refreshBtn.addEventListener('click', () => {
-            if (pollInterval) {
+            if (eventSource) {
                 updateStatus();
             }
         });
@@ -806,10 +1348,13 @@ KANBAN_HTML = """
                 const data = await response.json();
                 
                 if (data.success) {
+                    // Versions restart with every run
+                    stateVersion = null;
+                    currentTasks.forEach(t => { delete t.version; });
                     isRunning = true;
                     runBtn.disabled = true;
                     stopBtn.disabled = false;
-                    startPolling();
+                    startStream();
                 } else {
                     alert('Error: ' + data.error);
                 }
@@ -822,7 +1367,7 @@ KANBAN_HTML = """
             try {
                 await fetch('/api/stop', { method: 'POST' });
                 stopBtn.disabled = true;
-                stopPolling();
+                stopStream();
                 isRunning = false;
             } catch (error) {
                 alert('Error stopping execution: ' + error.message);
@@ -834,28 +1379,135 @@ KANBAN_HTML = """
             filePathInput.focus();
         });
         
-        function startPolling() {
-            if (pollInterval) clearInterval(pollInterval);
-            pollInterval = setInterval(updateStatus, 1000);
-            updateStatus();
+        // Status changes are pushed over server-sent events; /api/status is
+        // only fetched for a full snapshot when the stream (re)connects
+        function startStream() {
+            stopStream();
+            eventSource = new EventSource('/api/stream');
+            eventSource.onopen = () => updateStatus();
+            eventSource.onmessage = (ev) => applyEvent(JSON.parse(ev.data));
+        }
+        
+        function stopStream() {
+            if (eventSource) {
+                eventSource.close();
+                eventSource = null;
+            }
+        }
+        
+        function applyEvent(event) {
+            if (event.type === 'done') {
+                stopStream();
+                updateStatus();
+                runBtn.disabled = false;
+                stopBtn.disabled = true;
+                isRunning = false;
+                return;
+            }
+            
+            if (!event.tasks.every(applyDelta)) {
+                // Tree changed under us; resynchronize
+                stateVersion = null;
+                updateStatus();
+                return;
+            }
+            scheduleRender();
         }
         
-        function stopPolling() {
-            if (pollInterval) {
-                clearInterval(pollInterval);
-                pollInterval = null;
+        // Tasks from a snapshot reflect every change up to its version
+        function setTasks(tasks, version) {
+            if (version !== undefined) {
+                tasks.forEach(t => { t.version = version; });
             }
+            currentTasks = tasks;
+            tasksById = new Map(tasks.map(t => [t.id, t]));
+            renderAll = true;
+        }
+        
+        function applyDelta(delta) {
+            const task = tasksById.get(delta.id);
+            if (!task) return false;
+            // Stream frames can carry changes the task already reflects;
+            // never let an older change overwrite a newer one
+            if (task.version >= delta.version) return true;
+            task.version = delta.version;
+            if (task.status !== delta.status || task.start_time !== delta.start_time ||
+                    task.end_time !== delta.end_time || task.error !== delta.error) {
+                task.status = delta.status;
+                task.start_time = delta.start_time;
+                task.end_time = delta.end_time;
+                task.error = delta.error;
+                changedIds.add(task.id);
+            }
+            return true;
+        }
+        
+        // Bursts of updates are coalesced into one render per frame, and
+        // frames where no task changed are skipped
+        function scheduleRender() {
+            if (renderPending) return;
+            renderPending = true;
+            requestAnimationFrame(() => {
+                renderPending = false;
+                if (renderAll) {
+                    renderBoard(currentTasks);
+                } else if (changedIds.size) {
+                    patchCards(changedIds);
+                } else {
+                    return;
+                }
+                renderAll = false;
+                changedIds.clear();
+                
+                // Every figure below follows from the column sizes
+                const size = key => boardColumns[key].size;
+                updateStats(currentTasks.length, size('running'), size('waiting_human') + size('blocked'));
+                
+                const total = currentTasks.length;
+                const done = size('completed') + size('failed');
+                globalProgress.style.width = (total > 0 ? Math.round(done / total * 100) : 0) + '%';
+                
+                const workers = size('running');
+                if (workers > 0) {
+                    workerStatus.style.display = 'flex';
+                    workerCount.textContent = workers;
+                } else {
+                    workerStatus.style.display = 'none';
+                }
+                
+                // The server counts one tool call per finished task
+                if (done > 0) {
+                    agentStatus.style.display = 'flex';
+                    agentCount.textContent = workers;
+                    toolCalls.textContent = done;
+                }
+            });
         }
         
         async function updateStatus() {
             try {
-                const response = await fetch('/api/status');
+                // After the first snapshot only changes are fetched
+                const url = stateVersion === null ? '/api/status' : `/api/status?since=${stateVersion}`;
+                const response = await fetch(url);
                 const data = await response.json();
                 
-                if (data.tasks && data.tasks.length > 0) {
-                    currentTasks = data.tasks;
-                    renderBoard(data.tasks);
-                    updateStats(data.tasks);
+                if (data.deltas) {
+                    if (!data.deltas.every(applyDelta)) {
+                        stateVersion = null;
+                        return updateStatus();
+                    }
+                } else if (data.tasks) {
+                    // A run still building its tree has no tasks yet; keep
+                    // the loaded board until its first changes arrive
+                    if (!data.tasks.length && data.running) return;
+                    setTasks(data.tasks, data.version);
+                }
+                if (data.version !== undefined) {
+                    stateVersion = data.version;
+                }
+                
+                if (currentTasks.length > 0) {
+                    scheduleRender();
                     
                     if (data.progress) {
                         const percentage = Math.round(data.progress.percentage);
@@ -880,8 +1532,8 @@ KANBAN_HTML = """
                     }
                 }
                 
-                if (!data.running && pollInterval) {
-                    stopPolling();
+                if (!data.running && eventSource) {
+                    stopStream();
                     runBtn.disabled = false;
                     stopBtn.disabled = true;
                     isRunning = false;
@@ -891,11 +1543,7 @@ KANBAN_HTML = """
             }
         }
         
-        function updateStats(tasks) {
-            const total = tasks.length;
-            const active = tasks.filter(t => t.status === 'running').length;
-            const review = tasks.filter(t => t.status === 'waiting_human' || t.status === 'blocked').length;
-            
+        function updateStats(total, active, review) {
             statTotal.textContent = total;
             statActive.textContent = active;
             statReview.textContent = review;
@@ -908,70 +1556,201 @@ KANBAN_HTML = """
             }
         }
         
+        // Board columns in display order; tasks in any other status are
+        // shown as pending. Lookup tables are frozen, built once per page.
+        const BOARD_COLUMNS = Object.freeze([
+            ['pending', '⏳ Pending'],
+            ['running', '🔄 Running'],
+            ['waiting_human', '👤 Human Gate'],
+            ['completed', '✅ Completed'],
+            ['failed', '❌ Failed'],
+            ['blocked', '⏸️ Blocked']
+        ].map(Object.freeze));
+        
+        const STATUS_TAGS = Object.freeze({
+            'pending': Object.freeze({ tag: 'PENDING', class: 'tag-pending' }),
+            'running': Object.freeze({ tag: 'RUNNING', class: 'tag-running' }),
+            'starting': Object.freeze({ tag: 'STARTING', class: 'tag-starting' }),
+            'completed': Object.freeze({ tag: 'COMPLETED', class: 'tag-completed' }),
+            'failed': Object.freeze({ tag: 'FAILED', class: 'tag-failed' }),
+            'blocked': Object.freeze({ tag: 'BLOCKED', class: 'tag-blocked' }),
+            'waiting_human': Object.freeze({ tag: 'AWAITING HUMAN', class: 'tag-awaiting' })
+        });
+        
+        // Rendered board: column elements by status, card elements by task
+        // id, and what each card was last rendered from
+        let boardColumns = null;
+        const cardsById = new Map();
+        const renderedTasks = new Map();
+        
+        // Columns are cloned from the page's template and attached together
+        function buildColumns() {
+            const fragment = document.createDocumentFragment();
+            boardColumns = {};
+            for (const [key, title] of BOARD_COLUMNS) {
+                const column = columnTemplate.cloneNode(true);
+                column.dataset.status = key;
+                column.querySelector('.column-title').textContent = title;
+                boardColumns[key] = {
+                    count: column.querySelector('.column-count'),
+                    sections: column.querySelector('.column-sections'),
+                    empty: column.querySelector('.empty-state'),
+                    fragment: null,
+                    size: 0,
+                    tally: 0
+                };
+                fragment.appendChild(column);
+            }
+            kanbanBoard.replaceChildren(fragment);
+        }
+        
+        function removeCard(id) {
+            cardsById.get(id).remove();
+            cardsById.delete(id);
+            renderedTasks.delete(id);
+        }
+        
+        // Cards within a column keep the tasks' tree order
+        function insertCard(sections, card) {
+            const last = sections.lastElementChild;
+            if (!(last.taskIndex > card.taskIndex)) {
+                sections.appendChild(card);
+                return;
+            }
+            let before = null;
+            for (const other of sections.children) {
+                if (other.taskIndex > card.taskIndex) {
+                    before = other;
+                    break;
+                }
+            }
+            sections.insertBefore(card, before);
+        }
+        
+        // Cards are cloned from the page's template and filled in through
+        // textContent; each keeps references to its parts for later updates
+        function createTaskCardNode(task, index) {
+            const card = taskCardTemplate.cloneNode(true);
+            card.dataset.taskId = task.id;
+            card.taskIndex = index;
+            card.tagEl = card.querySelector('.task-tag');
+            card.titleEl = card.querySelector('.task-title');
+            card.missionEl = card.querySelector('.task-mission');
+            card.pathEl = card.querySelector('.task-path');
+            updateTaskCardNode(card, task, null);
+            return card;
+        }
+        
+        // Writes only the parts of a card that differ from what it was last
+        // rendered from
+        function updateTaskCardNode(card, task, previous) {
+            if (!previous || previous.status !== task.status) {
+                const statusInfo = STATUS_TAGS[task.status] || STATUS_TAGS['pending'];
+                card.className = `task-card ${task.status}`;
+                card.tagEl.className = `task-tag ${statusInfo.class}`;
+                card.tagEl.textContent = statusInfo.tag;
+            }
+            if (!previous || previous.task !== task.task) {
+                card.titleEl.textContent = task.task || task.id;
+            }
+            if (!previous || previous.action !== task.action) {
+                card.missionEl.textContent = task.action || 'Build MVP';
+            }
+            if (!previous || previous.task_path !== task.task_path) {
+                card.pathEl.textContent = task.task_path || '';
+                card.pathEl.style.display = task.task_path ? '' : 'none';
+            }
+        }
+        
+        // The board is patched in place: only cards whose task changed are
+        // created, updated or moved
         function renderBoard(tasks) {
-            const columns = {
-                'pending': { title: '⏳ Pending', icon: '⏳', tasks: [] },
-                'running': { title: '🔄 Running', icon: '🔄', tasks: [] },
-                'waiting_human': { title: '👤 Human Gate', icon: '👤', tasks: [] },
-                'completed': { title: '✅ Completed', icon: '✅', tasks: [] },
-                'failed': { title: '❌ Failed', icon: '❌', tasks: [] },
-                'blocked': { title: '⏸️ Blocked', icon: '⏸️', tasks: [] }
-            };
-            
-            tasks.forEach(task => {
-                const status = task.status || 'pending';
-                if (columns[status]) {
-                    columns[status].tasks.push(task);
-                } else if (status === 'completed' && task.task_path.includes('shipped')) {
-                    // Handle shipped tasks
-                    if (!columns['shipped']) {
-                        columns['shipped'] = { title: '📦 Shipped', icon: '📦', tasks: [] };
-                    }
-                    columns['shipped'].tasks.push(task);
+            if (!boardColumns) buildColumns();
+            
+            const ids = new Set(tasks.map(task => task.id));
+            for (const id of [...renderedTasks.keys()]) {
+                if (!ids.has(id)) removeCard(id);
+            }
+            // A different tree shape invalidates the cards' order; start over
+            if (tasks.some((task, index) => renderedTasks.has(task.id) && renderedTasks.get(task.id).index !== index)) {
+                for (const id of [...renderedTasks.keys()]) removeCard(id);
+            }
+            
+            // On first mount or after a reset every card is new; they are
+            // collected per column and attached with one append each
+            const mounting = renderedTasks.size === 0;
+            for (const [key] of BOARD_COLUMNS) {
+                boardColumns[key].tally = 0;
+                boardColumns[key].fragment = mounting ? document.createDocumentFragment() : null;
+            }
+            
+            tasks.forEach((task, index) => {
+                const column = boardColumns[task.status] ? task.status : 'pending';
+                const previous = renderedTasks.get(task.id);
+                let card = cardsById.get(task.id);
+                boardColumns[column].tally++;
+                
+                if (!card) {
+                    card = createTaskCardNode(task, index);
+                    cardsById.set(task.id, card);
                 } else {
-                    columns['pending'].tasks.push(task);
+                    updateTaskCardNode(card, task, previous);
+                }
+                
+                if (mounting) {
+                    boardColumns[column].fragment.appendChild(card);
+                } else if (!previous || previous.column !== column) {
+                    insertCard(boardColumns[column].sections, card);
                 }
+                renderedTasks.set(task.id, {
+                    status: task.status,
+                    task: task.task,
+                    action: task.action,
+                    task_path: task.task_path,
+                    column,
+                    index
+                });
             });
             
-            kanbanBoard.innerHTML = Object.entries(columns).map(([key, column]) => `
-                <div class="kanban-column">
-                    <div class="column-header">
-                        <span>${column.title}</span>
-                        <span class="column-count">${column.tasks.length}</span>
-                    </div>
-                    <div class="column-sections">
-                        ${column.tasks.length === 0 ? 
-                            '<div class="empty-state"><div class="empty-state-text">No tasks</div></div>' :
-                            column.tasks.map(task => renderTaskCard(task)).join('')
-                        }
-                    </div>
-                </div>
-            `).join('');
-        }
-        
-        function renderTaskCard(task) {
-            const statusMap = {
-                'pending': { tag: 'PENDING', class: 'tag-pending' },
-                'running': { tag: 'RUNNING', class: 'tag-running' },
-                'starting': { tag: 'STARTING', class: 'tag-starting' },
-                'completed': { tag: 'COMPLETED', class: 'tag-completed' },
-                'failed': { tag: 'FAILED', class: 'tag-failed' },
-                'blocked': { tag: 'BLOCKED', class: 'tag-blocked' },
-                'waiting_human': { tag: 'AWAITING HUMAN', class: 'tag-awaiting' }
-            };
-            
-            const statusInfo = statusMap[task.status] || statusMap['pending'];
-            const mission = task.action || 'Build MVP';
-            
-            return `
-                <div class="task-card ${task.status}" data-task-id="${task.id}">
-                    <div class="task-tag ${statusInfo.class}">${statusInfo.tag}</div>
-                    <div class="task-title">${task.task || task.id}</div>
-                    <div class="task-mission">${mission}</div>
-                    ${task.task_path ? `<div class="task-path">${task.task_path}</div>` : ''}
-                    ${task.action && task.action !== mission ? `<div class="task-action">${task.action}</div>` : ''}
-                </div>
-            `;
+            if (mounting) {
+                for (const [key] of BOARD_COLUMNS) {
+                    boardColumns[key].sections.appendChild(boardColumns[key].fragment);
+                    boardColumns[key].fragment = null;
+                }
+            }
+            syncColumnCounts();
+        }
+        
+        // Re-renders just the given tasks, whose cards already exist; the
+        // rest of the board is not visited
+        function patchCards(ids) {
+            for (const id of ids) {
+                const task = tasksById.get(id);
+                const card = cardsById.get(id);
+                if (!task || !card) continue;
+                
+                const previous = renderedTasks.get(id);
+                const column = boardColumns[task.status] ? task.status : 'pending';
+                updateTaskCardNode(card, task, previous);
+                if (previous.column !== column) {
+                    boardColumns[previous.column].tally--;
+                    boardColumns[column].tally++;
+                    insertCard(boardColumns[column].sections, card);
+                }
+                renderedTasks.set(id, { ...previous, status: task.status, column });
+            }
+            syncColumnCounts();
+        }
+        
+        function syncColumnCounts() {
+            for (const [key] of BOARD_COLUMNS) {
+                const column = boardColumns[key];
+                if (column.size !== column.tally) {
+                    column.size = column.tally;
+                    column.count.textContent = column.size;
+                    column.empty.style.display = column.size ? 'none' : '';
+                }
+            }
         }
         
         // Initial empty state
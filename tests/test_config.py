@@ -0,0 +1,29 @@
+"""
+Tests for task configuration loading.
+"""
+
+import unittest
+
+from loom.config import _parse_yaml, validate_task_config
+
+
+class ValidateTaskConfigTest(unittest.TestCase):
+    """Validation and normalization of parsed configs."""
+
+    def test_aliased_sub_tasks_get_their_own_ids(self):
+        config = validate_task_config(_parse_yaml(
+            "task: Root\n"
+            "sub_tasks:\n"
+            "  - &step {task: Lint}\n"
+            "  - *step\n"
+            "  - id: last\n"
+            "    task: Last\n"
+        ))
+
+        ids = [sub_task["id"] for sub_task in config["sub_tasks"]]
+        self.assertEqual(ids, ["subtask_0", "subtask_1", "last"])
+        self.assertIsNot(config["sub_tasks"][0], config["sub_tasks"][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests for the task engine.
+"""
+
+import copy
+import tempfile
+import unittest
+from pathlib import Path
+
+from loom.engine import TaskEngine
+from loom.state import StateManager
+from loom.status import TaskStatus
+
+
+CONFIG = {
+    "task": "Pipeline",
+    "sub_tasks": [
+        {"id": "extract", "task": "Extract", "action": "Read the source"},
+        {"id": "transform", "task": "Transform", "action": "Reshape rows",
+         "depends_on": ["extract"]},
+        {"id": "load", "task": "Load", "action": "Write the output",
+         "depends_on": ["transform"]},
+        {"id": "report", "task": "Report", "action": "Summarize the run"},
+    ],
+}
+
+
+class ResumeTest(unittest.TestCase):
+    """Reuse of previous results when resuming a saved execution."""
+
+    def setUp(self):
+        self.state_dir = tempfile.TemporaryDirectory()
+        self.state_manager = StateManager(Path(self.state_dir.name))
+
+        with TaskEngine() as engine:
+            engine.execute(copy.deepcopy(CONFIG))
+            self.state_manager.save_state(
+                "first", engine.root_node, engine.all_nodes,
+                parent_ids=engine.parent_ids, child_ids=engine.child_ids
+            )
+
+    def tearDown(self):
+        self.state_dir.cleanup()
+
+    def _resume(self, config):
+        with TaskEngine() as engine:
+            engine.resume(config, "first", self.state_manager)
+            return engine
+
+    def test_unchanged_tasks_are_reused(self):
+        engine = self._resume(copy.deepcopy(CONFIG))
+
+        self.assertEqual(engine._resumed, {"root", "extract", "transform", "load", "report"})
+        self.assertEqual(engine.root_node.status, TaskStatus.COMPLETED)
+
+    def test_changed_upstream_task_reruns_dependents(self):
+        config = copy.deepcopy(CONFIG)
+        config["sub_tasks"][0]["action"] = "Read the new source"
+        engine = self._resume(config)
+
+        self.assertNotIn("extract", engine._resumed)
+        self.assertNotIn("transform", engine._resumed)
+        self.assertNotIn("load", engine._resumed)
+        self.assertIn("report", engine._resumed)
+        self.assertEqual(engine.root_node.status, TaskStatus.COMPLETED)
+
+
+class ExecuteTest(unittest.TestCase):
+    """Running task trees on an engine."""
+
+    def test_second_execute_rebuilds_tree_state(self):
+        with TaskEngine() as engine:
+            engine.execute(copy.deepcopy(CONFIG))
+            engine.execute(copy.deepcopy(CONFIG))
+
+            self.assertEqual(engine.child_ids, {"root": ["extract", "transform", "load", "report"]})
+            self.assertEqual(len(engine.parent_ids), 4)
+            self.assertEqual(len(engine.all_nodes), 5)
+            self.assertEqual(engine.completed_count, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()